@@ -0,0 +1,44 @@
+"""
+Script to create the indexes declared in models.py that an existing database
+is missing. create_all only adds indexes together with new tables, so
+databases created before an index was declared need this step. Existing
+indexes are skipped, so it is safe to run more than once. migrations.py
+creates each index in the step that introduced it; this script repairs
+databases that missed one.
+"""
+from sqlalchemy import inspect
+from database import Base
+import models  # noqa: F401 - registers the tables on Base
+
+def create_missing_indexes(conn) -> list:
+    """Create every declared index that does not exist yet; returns their names"""
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        columns = {c["name"] for c in inspector.get_columns(table.name)}
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            # Columns a later migration adds get their index from that migration
+            if not {c.name for c in index.columns} <= columns:
+                continue
+            # Unique indexes would add a constraint to existing data; leave those to a deliberate migration
+            if index.name not in existing and not index.unique:
+                index.create(conn)
+                created.append(index.name)
+    return created
+
+if __name__ == "__main__":
+    from database import engine
+    print("=" * 50)
+    print("Creating missing query indexes...")
+    print("=" * 50)
+    with engine.begin() as conn:
+        names = create_missing_indexes(conn)
+    for name in names:
+        print(f"Created index {name}")
+    print(f"{len(names)} index(es) created.")
+    print("=" * 50)
+    print("Done!")
@@ -0,0 +1,39 @@
+"""
+Script to link existing milestone grid rows to their projects via project_fk.
+Rows are matched to projects by name (case-insensitive), which is how they were
+linked before project_fk existed. Only rows without a project_fk are touched,
+so it is safe to run more than once (it is also a step in migrations.py).
+"""
+from sqlalchemy import text
+
+GRID_TABLES = ("milestone_grid", "site_execution_milestone_grid")
+
+def backfill_project_fk(conn) -> int:
+    """Set project_fk on unlinked grid rows whose project_name matches a project"""
+    linked = 0
+    for table in GRID_TABLES:
+        result = conn.execute(text(f"""
+            UPDATE {table}
+            SET project_fk = (
+                SELECT MIN(projects.id) FROM projects
+                WHERE lower(projects.name) = lower({table}.project_name)
+            )
+            WHERE project_fk IS NULL
+              AND EXISTS (
+                SELECT 1 FROM projects
+                WHERE lower(projects.name) = lower({table}.project_name)
+              )
+        """))
+        linked += result.rowcount or 0
+    return linked
+
+if __name__ == "__main__":
+    from database import engine
+    print("=" * 50)
+    print("Backfilling milestone grid project_fk...")
+    print("=" * 50)
+    with engine.begin() as conn:
+        count = backfill_project_fk(conn)
+    print(f"Linked {count} grid row(s) to their projects.")
+    print("=" * 50)
+    print("Done!")
@@ -0,0 +1,89 @@
+"""
+Benchmark: cold start, from launching a fresh Python process to the first
+response. Each trial starts a new interpreter that imports server, runs the
+startup event and sends GET /health through httpx's ASGITransport (the same
+request a Cloud Run startup probe makes), and reports import time, startup
+time and time-to-first-request measured from the moment the process was
+launched. Runs the default mode (migrations at startup) and COLD_START_MODE=1
+against one scratch database that migrations.py has already brought current,
+the way a deploy leaves it.
+
+Needs httpx (also required by FastAPI's TestClient).
+
+Usage: python bench_cold_start.py [--trials 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+async def first_request(launched: float) -> dict:
+    import httpx
+    import server
+
+    started = time.perf_counter()
+    await server.startup_event()
+    startup_seconds = time.perf_counter() - started
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get("/health")
+        response.raise_for_status()
+    first_response = time.time()
+    await server.shutdown_event()
+    return {
+        "import_ms": server.IMPORT_SECONDS * 1000,
+        "startup_ms": startup_seconds * 1000,
+        "ttfr_ms": (first_response - launched) * 1000,
+    }
+
+def run_mode(label: str, cold_start: bool, env: dict, workdir: str, trials: int) -> None:
+    """Time `trials` fresh processes and print the medians"""
+    env = dict(env, COLD_START_MODE="1" if cold_start else "0")
+    results = []
+    for _ in range(trials):
+        launched = time.time()
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", str(launched)],
+            cwd=workdir, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    median = {key: statistics.median(r[key] for r in results) for key in results[0]}
+    print(f"{label:<20}{median['import_ms']:>10.0f}{median['startup_ms']:>10.1f}{median['ttfr_ms']:>10.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--child", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        import logging
+        logging.disable(logging.CRITICAL)
+        print(json.dumps(asyncio.run(first_request(args.child))))
+        sys.exit(0)
+
+    workdir = tempfile.mkdtemp(prefix="bench_cold_start_")
+    os.makedirs(os.path.join(workdir, "uploads"))
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        PYTHONPATH=BACKEND_DIR,
+    )
+    subprocess.run([sys.executable, os.path.join(BACKEND_DIR, "migrations.py")],
+                   cwd=workdir, env=env, capture_output=True, check=True)
+
+    print("=" * 50)
+    print(f"Cold start: median of {args.trials} fresh process(es)")
+    print("=" * 50)
+    print(f"{'mode':<20}{'import':>10}{'startup':>10}{'ttfr':>10}   (ms)")
+    run_mode("migrate at startup", False, env, workdir, args.trials)
+    run_mode("COLD_START_MODE=1", True, env, workdir, args.trials)
+    print("=" * 50)
+    print("Done!")
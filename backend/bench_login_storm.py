@@ -0,0 +1,124 @@
+"""
+Benchmark: login storm vs. the rest of the API.
+Fires a burst of concurrent logins at the app in-process while one client keeps
+reading /api/issues, and reports login latency, how many logins were shed with
+503, and the collateral latency on the reads (against a quiet baseline). Runs
+twice in fresh processes on a scratch database: bcrypt in the request
+threadpool (BCRYPT_WORKERS=0, the old behaviour) and on the bounded process pool.
+
+Needs httpx (also required by FastAPI's TestClient).
+
+Usage: python bench_login_storm.py [--logins 60] [--rounds 12] [--workers 1] [--queue-limit 32]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ADMIN = {"email": "admin@tantiautomatics.com", "password": "admin123"}
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000
+
+async def read_loop(client, headers, stop: asyncio.Event, latencies: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/api/issues", headers=headers)
+        latencies.append(time.perf_counter() - started)
+
+async def storm(logins: int) -> dict:
+    import httpx
+    import server
+
+    await server.startup_event()
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        token = (await client.post("/api/auth/login", json=ADMIN)).json()["token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        baseline = []
+        stop = asyncio.Event()
+        reader = asyncio.create_task(read_loop(client, headers, stop, baseline))
+        await asyncio.sleep(1)
+        stop.set()
+        await reader
+
+        async def login():
+            started = time.perf_counter()
+            response = await client.post("/api/auth/login", json=ADMIN)
+            return response.status_code, time.perf_counter() - started
+
+        during = []
+        stop = asyncio.Event()
+        reader = asyncio.create_task(read_loop(client, headers, stop, during))
+        results = await asyncio.gather(*(login() for _ in range(logins)))
+        stop.set()
+        await reader
+    server.password_hashing.shutdown()
+
+    ok = [elapsed for status, elapsed in results if status == 200]
+    return {
+        "login_ok": len(ok),
+        "login_503": sum(1 for status, _ in results if status == 503),
+        "login_p50_ms": percentile(ok, 0.50),
+        "login_p95_ms": percentile(ok, 0.95),
+        "read_baseline_p95_ms": percentile(baseline, 0.95),
+        "read_p50_ms": percentile(during, 0.50),
+        "read_p95_ms": percentile(during, 0.95),
+        "reads": len(during),
+    }
+
+def run_mode(label: str, workers: int, args) -> dict:
+    """Run one storm in a fresh process with its own scratch database"""
+    workdir = tempfile.mkdtemp(prefix="bench_login_")
+    os.makedirs(os.path.join(workdir, "uploads"))
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        BCRYPT_ROUNDS=str(args.rounds),
+        BCRYPT_WORKERS=str(workers),
+        BCRYPT_QUEUE_LIMIT=str(args.queue_limit),
+        PYTHONPATH=os.path.dirname(os.path.abspath(__file__)),
+    )
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", "--logins", str(args.logins)],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    print(f"{label:<14}{result['login_ok']:>6}{result['login_503']:>6}"
+          f"{result['login_p50_ms']:>10.0f}{result['login_p95_ms']:>10.0f}"
+          f"{result['read_baseline_p95_ms']:>11.1f}{result['read_p50_ms']:>10.1f}{result['read_p95_ms']:>10.1f}")
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=60)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=1, help="process pool size for the pooled run")
+    parser.add_argument("--queue-limit", type=int, default=32)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        import logging
+        logging.disable(logging.CRITICAL)
+        print(json.dumps(asyncio.run(storm(args.logins))))
+        sys.exit(0)
+
+    print("=" * 50)
+    print(f"Login storm: {args.logins} concurrent logins, bcrypt rounds {args.rounds}, "
+          f"pool {args.workers} worker(s) / queue limit {args.queue_limit}")
+    print("=" * 50)
+    print(f"{'mode':<14}{'ok':>6}{'503':>6}{'login p50':>10}{'login p95':>10}"
+          f"{'read base':>11}{'read p50':>10}{'read p95':>10}   (ms)")
+    run_mode("threadpool", 0, args)
+    run_mode("process pool", args.workers, args)
+    print("=" * 50)
+    print("Done!")
@@ -0,0 +1,117 @@
+"""
+Benchmark: SQLite connection profile on the milestone grid edit workload.
+Runs concurrent cell-edit writers and full-grid readers against a scratch
+database, once with SQLite's defaults (rollback journal, synchronous=FULL)
+and once with the SQLITE_PRAGMAS profile from database.py, and prints the
+throughput of each.
+
+Usage: python bench_sqlite_pragmas.py [--rows 300] [--writers 4] [--readers 4] [--seconds 5]
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from database import Base, SQLITE_PRAGMAS, apply_sqlite_pragmas
+import models  # noqa: F401 - registers the tables on Base
+import milestone_bits
+import milestone_schema
+
+DEFAULT_PROFILE = {"journal_mode": "DELETE", "synchronous": "FULL"}
+
+def make_engine(path: str, pragmas: dict):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 30})
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+    return engine
+
+def seed(engine, rows: int):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for i in range(rows):
+            conn.execute(text("""
+                INSERT INTO milestone_grid (project_id, project_name, branch, priority, status,
+                                            progress_pct, checkbox_bits, checkbox_bits_version, updated_at)
+                VALUES (:pid, :name, 'Bengaluru', 'Low', 'Active', 0, 0, :version, :now)
+            """), {"pid": f"TAPL{i:04d}", "name": f"Bench {i}", "version": milestone_bits.CURRENT_LAYOUT_VERSION, "now": datetime.utcnow()})
+
+def run_profile(label: str, pragmas: dict, args) -> dict:
+    tmpdir = tempfile.mkdtemp(prefix="bench_sqlite_")
+    engine = make_engine(os.path.join(tmpdir, "bench.db"), pragmas)
+    seed(engine, args.rows)
+
+    stop = threading.Event()
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def writer():
+        rnd = random.Random()
+        while not stop.is_set():
+            row_id = rnd.randint(1, args.rows)
+            bit = 1 << rnd.randrange(len(milestone_bits.CHECKBOX_FIELDS))
+            try:
+                with engine.begin() as conn:
+                    bits = conn.execute(text("SELECT checkbox_bits FROM milestone_grid WHERE id = :id"), {"id": row_id}).scalar() or 0
+                    bits ^= bit
+                    conn.execute(text("""
+                        UPDATE milestone_grid SET checkbox_bits = :bits, progress_pct = :pct, updated_at = :now
+                        WHERE id = :id
+                    """), {"bits": bits, "pct": milestone_schema.progress_from_bits(bits), "now": datetime.utcnow(), "id": row_id})
+                key = "writes"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    def reader():
+        while not stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT * FROM milestone_grid")).fetchall()
+                key = "reads"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=writer) for _ in range(args.writers)]
+    threads += [threading.Thread(target=reader) for _ in range(args.readers)]
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    engine.dispose()
+
+    result = {k: v / args.seconds for k, v in counts.items()}
+    print(f"{label:<12} writes/s: {result['writes']:8.1f}   reads/s: {result['reads']:8.1f}   lock errors/s: {result['errors']:6.1f}")
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print(f"SQLite profile benchmark: {args.rows} grid rows, {args.writers} writer(s), {args.readers} reader(s), {args.seconds}s each")
+    print("=" * 50)
+    before = run_profile("default", DEFAULT_PROFILE, args)
+    after = run_profile("production", SQLITE_PRAGMAS, args)
+    print("=" * 50)
+    for key in ("writes", "reads"):
+        if before[key]:
+            print(f"{key}: {after[key] / before[key]:.1f}x")
+    print("Done!")
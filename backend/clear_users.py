@@ -1,10 +1,15 @@
 """
 Script to clear all user login data from the database.
 This will delete all users except admin@tantiautomatics.com so you can register from scratch.
+The delete bumps the users counter in table_versions, so cached user lists
+(ETags) are invalidated at once. Running servers revoke the deleted users'
+tokens and drop them from their user cache at the next revocation refresh
+(REVOCATION_REFRESH_SECONDS, default 30 seconds; see principal.py).
 """
 from database import get_db, engine
 from models import User
 from sqlalchemy import text
+import table_versions  # noqa: F401 - bumps the users counter on the delete
 
 def clear_all_users():
     """Delete all users from the database except admin@tantiautomatics.com"""
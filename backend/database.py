@@ -1,18 +1,226 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, JSON
+"""
+Database configuration for every deployment target.
+The backend is selected by environment: DB_TYPE = "sqlite" (default),
+"postgresql" or "mysql", or a full DATABASE_URL. Pool settings can be tuned
+per deployment with DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+DB_POOL_RECYCLE and DB_POOL_PRE_PING; defaults depend on the backend.
+
+Besides the sync engine/SessionLocal/get_db there is an asyncio engine on the
+same database (aiosqlite for SQLite, asyncpg for PostgreSQL, aiomysql for
+MySQL) with AsyncSessionLocal/get_async_db, used by the async endpoints.
+
+Reads can be routed to a read-only engine: a `mode=ro` connection to the same
+file for SQLite, or the replica in DB_READ_URL for other backends.
+get_routed_db/get_routed_async_db pick the engine per request: GET/HEAD go to
+the read engine, everything else to the primary. A request that must see its
+own recent writes (read-your-writes) is sent to the primary when it carries
+an `X-Read-Primary: 1` header or the READ_PRIMARY_COOKIE set after writes.
+DB_READ_ROUTING=0 sends everything to the primary.
+"""
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session, relationship
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from starlette.requests import Request
 from datetime import datetime
-from typing import Generator
+from typing import AsyncGenerator, Generator
 import os
+import threading
+import time
+
+# Database configuration from environment variables
+DB_TYPE = os.environ.get("DB_TYPE", "sqlite")  # "sqlite", "postgresql", "mysql"
+DB_HOST = os.environ.get("DB_HOST", "localhost")
+DB_PORT = os.environ.get("DB_PORT", "5432")
+DB_NAME = os.environ.get("DB_NAME", "tanti_projects")
+DB_USER = os.environ.get("DB_USER", "postgres")
+DB_PASSWORD = os.environ.get("DB_PASSWORD", "")
+
+# Pool defaults per backend. SQLite is a local file, so a small pool without
+# pre-ping or recycling is enough; network databases get a larger pool,
+# liveness checks, and recycling below typical server/proxy idle timeouts.
+POOL_DEFAULTS = {
+    "sqlite": {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30, "pool_recycle": -1, "pool_pre_ping": False},
+    "postgresql": {"pool_size": 10, "max_overflow": 20, "pool_timeout": 30, "pool_recycle": 1800, "pool_pre_ping": True},
+    "mysql": {"pool_size": 10, "max_overflow": 20, "pool_timeout": 30, "pool_recycle": 1800, "pool_pre_ping": True},
+}
+
+# SQLite connection profile, applied to every new connection.
+# WAL lets readers run alongside a writer; synchronous=NORMAL is durable
+# across application crashes in WAL mode and skips the fsync on every commit.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", "-65536")),  # negative = KiB (64 MiB)
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "temp_store": "MEMORY",
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+}
+
+# Read-only SQLite connections cannot change the journal mode or sync level
+SQLITE_READONLY_PRAGMAS = {
+    **{k: v for k, v in SQLITE_PRAGMAS.items() if k not in ("journal_mode", "synchronous")},
+    "query_only": 1,
+}
+
+READ_ROUTING = os.environ.get("DB_READ_ROUTING", "1").lower() not in ("0", "false", "no")
+READ_METHODS = {"GET", "HEAD"}
+# After a write the client is pinned to the primary for this long, so a
+# replica that lags behind cannot hide the write from the next read
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_YOUR_WRITES_SECONDS = int(os.environ.get("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
+# asyncio driver used for each backend by the async engine
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+def build_database_url(db_type: str = DB_TYPE) -> str:
+    if os.environ.get("DATABASE_URL"):
+        return os.environ["DATABASE_URL"]
+    if db_type == "postgresql":
+        return f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    if db_type == "mysql":
+        # MySQL connection string (using pymysql driver)
+        return f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    return "sqlite:///./tanti.db"
+
+def read_database_url(url: str):
+    """URL of the read-only engine for `url`, or None to read from the primary"""
+    if os.environ.get("DB_READ_URL"):
+        return os.environ["DB_READ_URL"]
+    if url_backend(url) == "sqlite":
+        path = url.split(":///", 1)[1] if ":///" in url else ""
+        if path and path != ":memory:" and not path.startswith("file:"):
+            return f"sqlite:///file:{path}?mode=ro&uri=true"
+    return None
+
+def pool_settings(db_type: str = DB_TYPE) -> dict:
+    """Pool keyword arguments for create_engine: backend defaults overridden by env"""
+    settings = dict(POOL_DEFAULTS.get(db_type, POOL_DEFAULTS["postgresql"]))
+    for key, env in (("pool_size", "DB_POOL_SIZE"), ("max_overflow", "DB_MAX_OVERFLOW"),
+                     ("pool_timeout", "DB_POOL_TIMEOUT"), ("pool_recycle", "DB_POOL_RECYCLE")):
+        if os.environ.get(env):
+            settings[key] = int(os.environ[env])
+    if os.environ.get("DB_POOL_PRE_PING"):
+        settings["pool_pre_ping"] = os.environ["DB_POOL_PRE_PING"].lower() in ("1", "true", "yes")
+    return settings
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict = SQLITE_PRAGMAS):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_time_total += waited
+                self.wait_time_max = max(self.wait_time_max, waited)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            checkouts = self.checkouts
+            return {
+                "pool_size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+                "wait_time_avg_ms": round(self.wait_time_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+            }
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """InstrumentedQueuePool for asyncio engines"""
+
+def url_backend(url: str) -> str:
+    """Backend name of a database URL, e.g. "postgresql" for postgresql+psycopg2://..."""
+    return url.split(":", 1)[0].split("+", 1)[0]
+
+def create_db_engine(url: str, sqlite_pragmas: dict = SQLITE_PRAGMAS, **overrides):
+    """Create an engine with the pool settings and connection hooks for its backend"""
+    backend = url_backend(url)
+    kwargs = {"poolclass": InstrumentedQueuePool, **pool_settings(backend), **overrides}
+    if backend == "sqlite":
+        kwargs.setdefault("connect_args", {"check_same_thread": False})
+    engine = create_engine(url, **kwargs)
+    if backend == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            apply_sqlite_pragmas(dbapi_connection, sqlite_pragmas)
+    return engine
 
-# SQLite database URL
-DATABASE_URL = "sqlite:///./tanti.db"
+def async_database_url(url: str) -> str:
+    """Same database as `url`, addressed through the backend's asyncio driver"""
+    return f"{ASYNC_DRIVERS[url_backend(url)]}://{url.split('://', 1)[1]}"
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+def create_async_db_engine(url: str, sqlite_pragmas: dict = SQLITE_PRAGMAS, **overrides):
+    """Create an asyncio engine with the same pool settings and hooks as create_db_engine"""
+    backend = url_backend(url)
+    kwargs = {"poolclass": InstrumentedAsyncQueuePool, **pool_settings(backend), **overrides}
+    engine = create_async_engine(async_database_url(url), **kwargs)
+    if backend == "sqlite":
+        @event.listens_for(engine.sync_engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            apply_sqlite_pragmas(dbapi_connection, sqlite_pragmas)
+    return engine
+
+DATABASE_URL = build_database_url()
+engine = create_db_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_db_engine(DATABASE_URL)
+# expire_on_commit=False: attribute access after commit must not trigger lazy IO
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+READ_DATABASE_URL = read_database_url(DATABASE_URL) if READ_ROUTING else None
+if READ_DATABASE_URL:
+    read_engine = create_db_engine(READ_DATABASE_URL, SQLITE_READONLY_PRAGMAS)
+    async_read_engine = create_async_db_engine(READ_DATABASE_URL, SQLITE_READONLY_PRAGMAS)
+else:
+    read_engine, async_read_engine = engine, async_engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
+def pool_stats(bind=None) -> dict:
+    """Live connection pool statistics for `bind` (default: the main engine)"""
+    pool = (bind or engine).pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {"status": pool.status()}
+
 # Dependency to get DB session
 def get_db() -> Generator:
     db = SessionLocal()
@@ -21,13 +229,33 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-# Create tables
-def init_db():
-    Base.metadata.create_all(bind=engine)
-
-
-
+# Dependency to get an async DB session
+async def get_async_db() -> AsyncGenerator:
+    async with AsyncSessionLocal() as db:
+        yield db
 
+def wants_primary(request: Request) -> bool:
+    """True when `request` must use the primary engine"""
+    if request.method not in READ_METHODS or request.headers.get("x-read-primary") == "1":
+        return True
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
 
+# Dependency to get a DB session routed by request (reads -> read engine)
+def get_routed_db(request: Request) -> Generator:
+    db = SessionLocal() if wants_primary(request) else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
 
+async def get_routed_async_db(request: Request) -> AsyncGenerator:
+    factory = AsyncSessionLocal if wants_primary(request) else AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
 
+# Create tables
+def init_db():
+    Base.metadata.create_all(bind=engine)
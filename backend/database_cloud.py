@@ -1,63 +1,9 @@
 """
-Database Configuration for Cloud/External Databases
-Supports PostgreSQL, MySQL, and SQLite (for development)
+Deprecated: database.py now selects the database from DB_TYPE / DATABASE_URL
+and configures pooling for every backend. Kept so existing imports
+(`from database_cloud import get_db, init_db`) keep working.
 """
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
-import os
-
-# Database configuration from environment variables
-DB_TYPE = os.environ.get("DB_TYPE", "sqlite")  # "sqlite", "postgresql", "mysql"
-DB_HOST = os.environ.get("DB_HOST", "localhost")
-DB_PORT = os.environ.get("DB_PORT", "5432")
-DB_NAME = os.environ.get("DB_NAME", "tanti_projects")
-DB_USER = os.environ.get("DB_USER", "postgres")
-DB_PASSWORD = os.environ.get("DB_PASSWORD", "")
-
-# Build database URL based on type
-if DB_TYPE == "postgresql":
-    # PostgreSQL connection string
-    DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-elif DB_TYPE == "mysql":
-    # MySQL connection string (using pymysql driver)
-    DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-else:
-    # SQLite (default for development)
-    DATABASE_URL = "sqlite:///./tanti.db"
-
-# Create engine with appropriate settings
-if DB_TYPE == "sqlite":
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False}
-    )
-else:
-    # For PostgreSQL and MySQL, use connection pooling
-    engine = create_engine(
-        DATABASE_URL,
-        pool_size=10,
-        max_overflow=20,
-        pool_pre_ping=True,  # Verify connections before using
-        echo=False  # Set to True for SQL query logging
-    )
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
-
-# Dependency to get DB session
-def get_db() -> Generator:
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-# Create tables
-def init_db():
-    Base.metadata.create_all(bind=engine)
-
-
-
-
+from database import (  # noqa: F401
+    DB_TYPE, DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD, DATABASE_URL,
+    engine, SessionLocal, Base, get_db, init_db, pool_stats,
+)
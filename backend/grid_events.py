@@ -0,0 +1,122 @@
+"""
+Live broadcast of milestone grid cell edits to /api/milestones/stream clients.
+
+The cell-update endpoints publish one small event per changed cell after their
+commit. Every connected client has its own bounded queue. A client that stops
+reading (slow network, background tab) never blocks writers or grows memory:
+when its queue is full the backlog is dropped and a single `resync` event is
+queued instead, telling the client to reload the grid once.
+
+A stream ends with a `revoked` event once its user's sessions are revoked
+(see principal.py); that is checked before every event and keepalive.
+
+Subscribers are held in-process, so with several server processes each client
+only sees edits handled by the process it is connected to.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+
+STREAM_QUEUE_SIZE = int(os.environ.get("GRID_STREAM_QUEUE_SIZE", "256"))
+STREAM_KEEPALIVE_SECONDS = 15
+
+TRACKER_SECONDARY_SALES = "secondary-sales"
+TRACKER_SITE_EXECUTION = "site-execution"
+
+RESYNC = {"type": "resync"}
+REVOKED = {"type": "revoked"}
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int = STREAM_QUEUE_SIZE):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def offer(self, event: dict) -> None:
+        """Queue an event; runs on the subscriber's event loop."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait(RESYNC)
+
+
+_subscribers = set()
+_lock = threading.Lock()
+
+
+def subscribe() -> Subscriber:
+    """Register a new client; must be called from the event loop serving it."""
+    subscriber = Subscriber(asyncio.get_running_loop())
+    with _lock:
+        _subscribers.add(subscriber)
+    return subscriber
+
+
+def unsubscribe(subscriber: Subscriber) -> None:
+    with _lock:
+        _subscribers.discard(subscriber)
+    if subscriber.dropped:
+        logger.info(f"Milestone stream client lagged; dropped {subscriber.dropped} event(s)")
+
+
+def subscriber_count() -> int:
+    return len(_subscribers)
+
+
+def cell_event(tracker: str, row, field: str) -> dict:
+    return {
+        "tracker": tracker,
+        "row_id": row.id,
+        "field": field,
+        "value": getattr(row, field),
+        "progress_pct": row.progress_pct,
+    }
+
+
+def publish(events: list) -> None:
+    """Hand events to every subscriber. Safe to call from worker threads."""
+    if not events:
+        return
+    with _lock:
+        subscribers = list(_subscribers)
+    for subscriber in subscribers:
+        for event in events:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.offer, event)
+            except RuntimeError:
+                # Event loop already closed (server shutting down)
+                unsubscribe(subscriber)
+                break
+
+
+def format_sse(event: dict) -> str:
+    name = event.get("type", "cell")
+    return f"event: {name}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def sse_stream(request, subscriber: Subscriber, is_authorized=lambda: True):
+    """Yield server-sent events for one client until it disconnects or
+    is_authorized() turns false."""
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                event = None
+            if not is_authorized():
+                yield format_sse(REVOKED)
+                break
+            yield ": keepalive\n\n" if event is None else format_sse(event)
+    finally:
+        unsubscribe(subscriber)
@@ -0,0 +1,35 @@
+"""
+Prebuilt statements for the lookups that run on nearly every request.
+
+Each statement is constructed once at import with named bind parameters and
+then reused. SQLAlchemy memoizes the cache key on the statement object, so
+executing it skips both building the query and walking it to look up the
+compiled form; a select() or db.query() built inline pays for both on every
+call. bench_hot_queries.py measures the difference.
+
+lambda_stmt() is not used: on SQLAlchemy 2.1 its per-call closure analysis
+makes ORM lookups slower than an inline select(), not faster.
+
+Execute with Session.scalar / AsyncSession.scalar and a parameter dict:
+
+    user = db.scalar(hot_queries.USER_BY_ID, {"user_id": user_id})
+"""
+from sqlalchemy import bindparam, func, select
+
+from models import User, Project, MilestoneGrid, SiteExecutionMilestoneGrid
+
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+
+# MilestoneGrid / SiteExecutionMilestoneGrid row by primary key
+GRID_ROW_BY_ID = {
+    model: select(model).where(model.id == bindparam("row_id"))
+    for model in (MilestoneGrid, SiteExecutionMilestoneGrid)
+}
+
+# Lowest-id project whose name matches case-insensitively
+PROJECT_BY_NAME = (
+    select(Project)
+    .where(func.lower(Project.name) == func.lower(bindparam("name")))
+    .order_by(Project.id)
+    .limit(1)
+)
@@ -1,7 +1,7 @@
 """Initialize database with admin user and sample data"""
 from database import init_db, SessionLocal
 from models import User, Project, MilestoneGrid, Notification, ActivityLog
-import bcrypt
+from password_hashing import hash_password
 from datetime import datetime, timedelta
 
 def init_database():
@@ -16,7 +16,7 @@ def init_database():
         admin = db.query(User).filter(User.email == "admin@tantiprojects.com").first()
         if not admin:
             # Create admin user
-            password_hash = bcrypt.hashpw("admin123".encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+            password_hash = hash_password("admin123")
             admin = User(
                 full_name="Admin User",
                 email="admin@tantiprojects.com",
@@ -0,0 +1,62 @@
+"""
+Script to convert existing milestone grid rows to bit-packed checkbox storage.
+Applies pending schema migrations (which add the checkbox_bits columns) and
+packs every row's Boolean checkbox columns into its bitmask. Safe to run more
+than once.
+"""
+from database import get_db, engine
+from models import MilestoneGrid, SiteExecutionMilestoneGrid
+from sqlalchemy import text
+import milestone_bits
+
+def add_bit_columns():
+    """Add checkbox_bits / checkbox_bits_version through the schema migrations"""
+    from migrations import run_migrations  # migrations imports pack_null_bits from here
+    applied = run_migrations(engine)
+    if applied:
+        print(f"Applied schema migration(s) {applied}")
+
+def pack_null_bits(conn) -> int:
+    """Pack checkbox_bits in SQL for rows that do not have a bitmask yet.
+    The migrations run this once so grid reads never fall back to the Boolean columns.
+    """
+    packed_expr = " + ".join(
+        f"CASE WHEN {field} THEN {1 << i} ELSE 0 END"
+        for i, field in enumerate(milestone_bits.CHECKBOX_FIELDS)
+    )
+    packed = 0
+    for table in ("milestone_grid", "site_execution_milestone_grid"):
+        result = conn.execute(text(f"""
+            UPDATE {table}
+            SET checkbox_bits = {packed_expr},
+                checkbox_bits_version = {milestone_bits.CURRENT_LAYOUT_VERSION}
+            WHERE checkbox_bits IS NULL
+        """))
+        packed += result.rowcount or 0
+    return packed
+
+def migrate_checkbox_bits():
+    """Pack the Boolean checkbox columns of every grid row into checkbox_bits"""
+    db = next(get_db())
+    try:
+        for model in (MilestoneGrid, SiteExecutionMilestoneGrid):
+            rows = db.query(model).all()
+            for row in rows:
+                milestone_bits.sync_from_columns(row)
+            print(f"Packed {len(rows)} row(s) in {model.__tablename__}")
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Error migrating checkbox bits: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Migrating milestone grid checkboxes to bitmask storage...")
+    print("=" * 50)
+    add_bit_columns()
+    migrate_checkbox_bits()
+    print("=" * 50)
+    print("Done!")
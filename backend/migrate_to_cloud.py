@@ -6,7 +6,7 @@ import asyncio
 import os
 from pathlib import Path
 from sqlalchemy.orm import Session
-from database_cloud import get_db, init_db
+from database import get_db, init_db
 from models import DesignDeliverable
 from storage_service import StorageService
 import logging
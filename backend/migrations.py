@@ -0,0 +1,260 @@
+"""
+Versioned schema migrations.
+
+Each migration is a numbered step that runs once per database. Applied steps
+are recorded in the `schema_version` table, so a database that is already
+current costs startup a table-existence check and a single SELECT. A new
+database (no `schema_version` table yet) first gets every declared table from
+create_all, then runs all steps; tables added to models.py after that need a
+step of their own. Steps use
+SQLAlchemy's inspector instead of SQLite PRAGMAs and skip work that is already
+done, so they behave the same on SQLite and Postgres and are safe on databases
+that were patched by the older startup code or one-off scripts.
+
+To change the schema, append a new step to MIGRATIONS; never renumber or edit
+a step that has shipped. Steps therefore spell out the columns and indexes they
+create instead of deriving them from the current models.
+
+The server applies pending migrations at startup unless COLD_START_MODE=1; in
+that mode run this script once per deploy (for Cloud Run, as a job before the
+new revision takes traffic).
+
+Usage: python migrations.py [--status]
+"""
+import logging
+from datetime import datetime
+
+from sqlalchemy import BigInteger, func, inspect, insert, select, text
+from sqlalchemy.exc import IntegrityError
+
+from database import Base
+from models import SchemaVersion, User
+from password_hashing import hash_password
+from backfill_project_fk import backfill_project_fk, GRID_TABLES
+from migrate_checkbox_bits import pack_null_bits
+import project_ids
+import table_versions
+
+logger = logging.getLogger(__name__)
+
+_schema_version = SchemaVersion.__table__
+_users = User.__table__
+
+ADMIN_EMAIL = "admin@tantiautomatics.com"
+
+
+def _add_column(conn, table: str, column: str, ddl: str) -> bool:
+    """ALTER TABLE ... ADD COLUMN unless the column already exists"""
+    if column in {c["name"] for c in inspect(conn).get_columns(table)}:
+        return False
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    logger.info(f"Added column {table}.{column}")
+    return True
+
+
+def _widen_to_bigint(conn, table: str, column: str) -> bool:
+    """Change an INTEGER column to BIGINT (SQLite integers are already 64-bit)"""
+    if conn.dialect.name == "sqlite":
+        return False
+    columns = {c["name"]: c for c in inspect(conn).get_columns(table)}
+    if isinstance(columns[column]["type"], BigInteger):
+        return False
+    if conn.dialect.name in ("mysql", "mariadb"):
+        conn.execute(text(f"ALTER TABLE {table} MODIFY {column} BIGINT NULL"))
+    else:
+        conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BIGINT"))
+    logger.info(f"Widened {table}.{column} to BIGINT")
+    return True
+
+
+def _create_index(conn, table: str, name: str, columns: tuple) -> bool:
+    """CREATE INDEX unless an index of that name exists (or the table does not)"""
+    inspector = inspect(conn)
+    if not inspector.has_table(table):
+        return False
+    if name in {ix["name"] for ix in inspector.get_indexes(table)}:
+        return False
+    conn.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
+    logger.info(f"Created index {name}")
+    return True
+
+
+def add_material_request_assignee_email(conn) -> None:
+    _add_column(conn, "material_requests", "assignee_email", "VARCHAR NULL")
+
+
+def add_grid_checkbox_bits(conn) -> None:
+    for table in GRID_TABLES:
+        _add_column(conn, table, "checkbox_bits", "BIGINT NULL")
+        _add_column(conn, table, "checkbox_bits_version", "INTEGER NULL")
+        # The bitmask holds 44 checkboxes; a column created as INTEGER overflows
+        # on Postgres/MySQL before step 4 packs it
+        _widen_to_bigint(conn, table, "checkbox_bits")
+
+
+def widen_grid_checkbox_bits(conn) -> None:
+    """Databases past step 2 may still have the original INTEGER column"""
+    for table in GRID_TABLES:
+        _widen_to_bigint(conn, table, "checkbox_bits")
+
+
+def add_grid_project_fk(conn) -> None:
+    for table in GRID_TABLES:
+        _add_column(conn, table, "project_fk", "INTEGER NULL REFERENCES projects(id)")
+
+
+def pack_grid_checkbox_bits(conn) -> None:
+    packed = pack_null_bits(conn)
+    if packed:
+        logger.info(f"Packed checkbox bits for {packed} milestone grid row(s)")
+
+
+def link_grid_rows_to_projects(conn) -> None:
+    linked = backfill_project_fk(conn)
+    if linked:
+        logger.info(f"Linked {linked} milestone grid row(s) to their projects")
+
+
+def create_list_query_indexes(conn) -> None:
+    """Grid project_fk / updated_at indexes and the composite list-query indexes"""
+    for table, name, columns in (
+        ("milestone_grid", "ix_milestone_grid_project_fk", ("project_fk",)),
+        ("milestone_grid", "ix_milestone_grid_updated_at", ("updated_at",)),
+        ("site_execution_milestone_grid", "ix_site_execution_milestone_grid_project_fk", ("project_fk",)),
+        ("site_execution_milestone_grid", "ix_site_execution_milestone_grid_updated_at", ("updated_at",)),
+        ("grid_tombstones", "ix_grid_tombstones_tracker", ("tracker",)),
+        ("grid_tombstones", "ix_grid_tombstones_deleted_at", ("deleted_at",)),
+        ("notifications", "ix_notifications_user_id_read_created_at", ("user_id", "read", "created_at")),
+        ("activity_logs", "ix_activity_logs_project_id_created_at", ("project_id", "created_at")),
+        ("activity_logs", "ix_activity_logs_user_id_action_created_at", ("user_id", "action", "created_at")),
+        ("design_deliverables", "ix_design_deliverables_project_id_type_created_at", ("project_id", "type", "created_at")),
+        ("documents", "ix_documents_project_id_type_created_at", ("project_id", "type", "created_at")),
+        ("issues", "ix_issues_project_id_created_at", ("project_id", "created_at")),
+        ("scope_items", "ix_scope_items_project_id_milestone_id", ("project_id", "milestone_id")),
+    ):
+        _create_index(conn, table, name, columns)
+
+
+def seed_table_versions(conn) -> None:
+    table_versions.seed(conn)
+
+
+def create_project_id_sequence(conn) -> None:
+    project_ids.create_sequence(conn)
+
+
+def add_user_token_version(conn) -> None:
+    _add_column(conn, "users", "token_version", "INTEGER NOT NULL DEFAULT 0")
+
+
+def bootstrap_admin_user(conn) -> None:
+    """Create the default admin account unless it already exists"""
+    if conn.execute(select(_users.c.id).where(_users.c.email == ADMIN_EMAIL)).first():
+        return
+    conn.execute(insert(_users).values(
+        full_name="Admin User",
+        email=ADMIN_EMAIL,
+        password_hash=hash_password("admin123"),
+        role="Admin",
+        region="Headquarters",
+        is_active=True,
+    ))
+    logger.info(f"Admin user created: {ADMIN_EMAIL}")
+
+
+def add_grid_change_seq(conn) -> None:
+    """Commit-ordered delta-sync counter on the grid rows and their tombstones"""
+    for table in (*GRID_TABLES, "grid_tombstones"):
+        _add_column(conn, table, "change_seq", "BIGINT NULL")
+    _create_index(conn, "milestone_grid", "ix_milestone_grid_change_seq", ("change_seq",))
+    _create_index(conn, "site_execution_milestone_grid", "ix_site_execution_milestone_grid_change_seq", ("change_seq",))
+    _create_index(conn, "grid_tombstones", "ix_grid_tombstones_tracker_change_seq", ("tracker", "change_seq"))
+
+
+def add_issues_list_index(conn) -> None:
+    """Unfiltered issue list, newest first"""
+    _create_index(conn, "issues", "ix_issues_created_at_id", ("created_at", "id"))
+
+
+# (version, name, step) in the order they must run
+MIGRATIONS = [
+    (1, "material_requests.assignee_email", add_material_request_assignee_email),
+    (2, "milestone grid checkbox_bits columns", add_grid_checkbox_bits),
+    (3, "milestone grid project_fk column", add_grid_project_fk),
+    (4, "pack milestone grid checkbox bits", pack_grid_checkbox_bits),
+    (5, "backfill milestone grid project_fk", link_grid_rows_to_projects),
+    (6, "declared indexes", create_list_query_indexes),
+    (7, "seed table_versions", seed_table_versions),
+    (8, "TAPL project id sequence", create_project_id_sequence),
+    (9, "users.token_version", add_user_token_version),
+    (10, "default admin user", bootstrap_admin_user),
+    (11, "milestone grid checkbox_bits BIGINT", widen_grid_checkbox_bits),
+    (12, "milestone grid change_seq", add_grid_change_seq),
+    (13, "issues list index", add_issues_list_index),
+]
+
+HEAD_VERSION = MIGRATIONS[-1][0]
+
+
+def has_schema_version(conn) -> bool:
+    return inspect(conn).has_table(_schema_version.name)
+
+
+def current_version(conn) -> int:
+    return conn.execute(select(func.coalesce(func.max(_schema_version.c.version), 0))).scalar()
+
+
+def pending_migrations(conn) -> list:
+    version = current_version(conn)
+    return [m for m in MIGRATIONS if m[0] > version]
+
+
+def run_migrations(engine) -> list:
+    """Apply pending migrations in one transaction; returns the versions applied.
+
+    If another process applies the same steps concurrently, its schema_version
+    rows make ours fail with an IntegrityError; the transaction is rolled back
+    and the other process's result is kept.
+    """
+    try:
+        with engine.begin() as conn:
+            if not has_schema_version(conn):
+                Base.metadata.create_all(conn)
+                logger.info("Created database tables")
+            pending = pending_migrations(conn)
+            for version, name, step in pending:
+                logger.info(f"Applying migration {version}: {name}")
+                step(conn)
+                conn.execute(insert(_schema_version).values(version=version, name=name, applied_at=datetime.utcnow()))
+    except IntegrityError:
+        logger.info("Migrations were applied by another process")
+        return []
+    return [version for version, _, _ in pending]
+
+
+if __name__ == "__main__":
+    import argparse
+    from database import engine
+
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument("--status", action="store_true", help="only show applied and pending migrations")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    print("=" * 50)
+    print("Schema migrations")
+    print("=" * 50)
+    with engine.connect() as conn:
+        if has_schema_version(conn):
+            print(f"Current version: {current_version(conn)} (head: {HEAD_VERSION})")
+            pending = pending_migrations(conn)
+        else:
+            print(f"New database, tables not created yet (head: {HEAD_VERSION})")
+            pending = MIGRATIONS
+        for version, name, _ in pending:
+            print(f"Pending: {version} {name}")
+    if not args.status:
+        applied = run_migrations(engine)
+        print(f"Applied {len(applied)} migration(s).")
+    print("=" * 50)
+    print("Done!")
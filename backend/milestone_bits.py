@@ -0,0 +1,150 @@
+"""
+Bit-packed checkbox storage for MilestoneGrid and SiteExecutionMilestoneGrid.
+
+Every grid row keeps its milestone checkboxes in a single integer
+(`checkbox_bits`). The bit position of each checkbox is fixed by a versioned
+layout: new checkboxes are only ever appended in a new layout version, so rows
+written under an older version can always be decoded.
+"""
+import base64
+from sqlalchemy.orm import defer
+
+# Bit position -> checkbox field, per layout version. Never reorder an existing
+# layout; add a new version instead.
+CHECKBOX_BIT_LAYOUTS = {
+    1: (
+        # Entry Point
+        'm_entry_electrical_labour',
+        'm_entry_electrical_design',
+        'm_entry_essential',
+        'm_entry_automation',
+        # Milestone 1 - Slab Conduits
+        'm1_slab1',
+        'm1_slab2',
+        'm1_slab3',
+        'm1_slab4',
+        # Milestone 2 - Wall Chipping
+        'm2_conduits',
+        'm2_db_wall_boxes',
+        # Milestone 3 - Wiring
+        'm3_wires',
+        'm3_comm_cables',
+        # Milestone 4 - DB Dressing
+        'm4_mcbs',
+        'm4_automation_backend',
+        'm4_networking_passive',
+        # Milestone 5 - Infrastructure
+        'm5_power_panels',
+        'm5_earthing',
+        'm5_gate_motor',
+        'm5_stabilizer',
+        'm5_ups',
+        'm5_solar',
+        # Milestone 6 - Switches
+        'm6_switches_int',
+        'm6_switches_ind',
+        'm6_frontend',
+        # Milestone 7 - Essentials
+        'm7_cctv',
+        'm7_vdp',
+        'm7_networking_active',
+        'm7_wifi',
+        'm7_digital_locks',
+        'm7_security_basic',
+        'm7_security_advanced',
+        'm7_intercomm',
+        'm7_motion_sensors',
+        'm7_water_mgmt',
+        # Milestone 8 - Light Fixtures
+        'm8_light_fixtures',
+        'm8_curtain_motor',
+        'm8_zonal_audio',
+        'm8_home_theater',
+        # Milestone 9 - Visualization
+        'm9_mobile_control',
+        'm9_hvac',
+        'm9_socket_timer',
+        'm9_heat_pump',
+        'm9_voice_control',
+        # Milestone 10 - Handover
+        'm10_handover',
+    ),
+}
+
+CURRENT_LAYOUT_VERSION = max(CHECKBOX_BIT_LAYOUTS)
+CHECKBOX_FIELDS = CHECKBOX_BIT_LAYOUTS[CURRENT_LAYOUT_VERSION]
+BIT_POSITIONS = {field: i for i, field in enumerate(CHECKBOX_FIELDS)}
+BITMASK_BYTES = (len(CHECKBOX_FIELDS) + 7) // 8
+
+
+def convert_bits(bits: int, from_version: int, to_version: int = CURRENT_LAYOUT_VERSION) -> int:
+    """Re-map a bitmask written under one layout version onto another."""
+    if from_version == to_version:
+        return bits
+    source = CHECKBOX_BIT_LAYOUTS[from_version]
+    target = {field: i for i, field in enumerate(CHECKBOX_BIT_LAYOUTS[to_version])}
+    converted = 0
+    for i, field in enumerate(source):
+        if bits >> i & 1 and field in target:
+            converted |= 1 << target[field]
+    return converted
+
+
+def pack_columns(row) -> int:
+    """Build a bitmask from the row's individual Boolean checkbox columns."""
+    bits = 0
+    for i, field in enumerate(CHECKBOX_FIELDS):
+        if getattr(row, field):
+            bits |= 1 << i
+    return bits
+
+
+def read_bits(row) -> int:
+    """Return the row's checkboxes as a current-layout bitmask.
+
+    Rows that predate bit-packing (NULL `checkbox_bits`) are packed from their
+    Boolean columns on first access.
+    """
+    if row.checkbox_bits is None:
+        return pack_columns(row)
+    return convert_bits(row.checkbox_bits, row.checkbox_bits_version or 1)
+
+
+def store_bits(row, bits: int) -> None:
+    row.checkbox_bits = bits
+    row.checkbox_bits_version = CURRENT_LAYOUT_VERSION
+
+
+def sync_from_columns(row) -> int:
+    """Pack the Boolean columns into the bitmask (used for new and migrated rows)."""
+    bits = pack_columns(row)
+    store_bits(row, bits)
+    return bits
+
+
+def write_checkbox(row, field: str, value: bool) -> int:
+    """Set one checkbox on a row and return the updated bitmask.
+
+    The legacy Boolean column is written as well so existing readers of the
+    per-column data keep working.
+    """
+    bits = read_bits(row)
+    mask = 1 << BIT_POSITIONS[field]
+    bits = bits | mask if value else bits & ~mask
+    store_bits(row, bits)
+    setattr(row, field, value)
+    return bits
+
+
+def to_base64(bits: int) -> str:
+    """Encode a bitmask as base64 of its little-endian bytes (bit i = byte i // 8, bit i % 8)."""
+    return base64.b64encode(bits.to_bytes(BITMASK_BYTES, "little")).decode("ascii")
+
+
+def unpack(bits: int) -> dict:
+    return {field: bool(bits >> i & 1) for i, field in enumerate(CHECKBOX_FIELDS)}
+
+
+def defer_checkbox_columns(model) -> list:
+    """Query options that skip loading the per-checkbox Boolean columns."""
+    return [defer(getattr(model, field)) for field in CHECKBOX_FIELDS]
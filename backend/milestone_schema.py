@@ -0,0 +1,196 @@
+"""
+Declarative schema for the milestone grids (Secondary Sales and Site Execution).
+
+Describes every milestone group, its checkbox fields and their weights, plus the
+descriptive columns shown in the grid. Everything derived from it (progress
+lookup tables, field validation, response models) is built once at import.
+"""
+from typing import Any, NamedTuple, Optional
+from pydantic import ConfigDict, create_model
+import milestone_bits
+
+
+class CheckboxField(NamedTuple):
+    name: str
+    label: str
+    weight: int = 1
+
+
+class MilestoneGroup(NamedTuple):
+    key: str
+    label: str
+    fields: tuple
+
+
+class GridField(NamedTuple):
+    name: str
+    type: Any
+    editable: bool = False
+
+
+MILESTONE_GROUPS = (
+    MilestoneGroup('entry', 'Entry Point', (
+        CheckboxField('m_entry_electrical_labour', 'Electrical Labour contract'),
+        CheckboxField('m_entry_electrical_design', 'Electrical Design Contract'),
+        CheckboxField('m_entry_essential', 'Essential contract'),
+        CheckboxField('m_entry_automation', 'Building Automation Contract'),
+    )),
+    MilestoneGroup('m1', 'Milestone 1 - Slab Conduits', (
+        CheckboxField('m1_slab1', 'Conduits, accessories, JBs, and Drop Boxes - SLAB 1'),
+        CheckboxField('m1_slab2', 'Conduits, accessories, JBs, and Drop Boxes - SLAB 2'),
+        CheckboxField('m1_slab3', 'Conduits, accessories, JBs, and Drop Boxes - SLAB 3'),
+        CheckboxField('m1_slab4', 'Conduits, accessories, JBs, and Drop Boxes - SLAB 4'),
+    )),
+    MilestoneGroup('m2', 'Milestone 2 - Wall Chipping', (
+        CheckboxField('m2_conduits', 'Conduits & accessories'),
+        CheckboxField('m2_db_wall_boxes', 'DB & Wall boxes'),
+    )),
+    MilestoneGroup('m3', 'Milestone 3 - Wiring', (
+        CheckboxField('m3_wires', 'Electrical wires'),
+        CheckboxField('m3_comm_cables', 'Communication cables'),
+    )),
+    MilestoneGroup('m4', 'Milestone 4 - DB Dressing', (
+        CheckboxField('m4_mcbs', 'MCBs & Protection'),
+        CheckboxField('m4_automation_backend', 'Automation Backend'),
+        CheckboxField('m4_networking_passive', 'Networking passive'),
+    )),
+    MilestoneGroup('m5', 'Milestone 5 - Infrastructure', (
+        CheckboxField('m5_power_panels', 'Power panels'),
+        CheckboxField('m5_earthing', 'Earthing'),
+        CheckboxField('m5_gate_motor', 'Gate Motor'),
+        CheckboxField('m5_stabilizer', 'Stabilizer'),
+        CheckboxField('m5_ups', 'UPS'),
+        CheckboxField('m5_solar', 'Solar Panels'),
+    )),
+    MilestoneGroup('m6', 'Milestone 6 - Switches', (
+        CheckboxField('m6_switches_int', 'Switches (Int.)'),
+        CheckboxField('m6_switches_ind', 'Switches (Ind.)'),
+        CheckboxField('m6_frontend', 'Frontend Components'),
+    )),
+    MilestoneGroup('m7', 'Milestone 7 - Essentials', (
+        CheckboxField('m7_cctv', 'CCTV'),
+        CheckboxField('m7_vdp', 'VDP'),
+        CheckboxField('m7_networking_active', 'Networking Active'),
+        CheckboxField('m7_wifi', 'Wi-Fi'),
+        CheckboxField('m7_digital_locks', 'Digital Locks'),
+        CheckboxField('m7_security_basic', 'Security Basic'),
+        CheckboxField('m7_security_advanced', 'Security Advanced'),
+        CheckboxField('m7_intercomm', 'EPBAX/Intercom'),
+        CheckboxField('m7_motion_sensors', 'Motion sensors'),
+        CheckboxField('m7_water_mgmt', 'Water management'),
+    )),
+    MilestoneGroup('m8', 'Milestone 8 - Light Fixtures', (
+        CheckboxField('m8_light_fixtures', 'Light Fixtures'),
+        CheckboxField('m8_curtain_motor', 'Curtain Motor/Blinds for Windows'),
+        CheckboxField('m8_zonal_audio', 'Zonal Audio'),
+        CheckboxField('m8_home_theater', 'Home theater'),
+    )),
+    MilestoneGroup('m9', 'Milestone 9 - Visualization', (
+        CheckboxField('m9_mobile_control', 'Visualization / Mobile Control'),
+        CheckboxField('m9_hvac', 'HVAC Control'),
+        CheckboxField('m9_socket_timer', 'Any Socket on Schedule or Timer control'),
+        CheckboxField('m9_heat_pump', 'Heat Pump On-Off control based on time'),
+        CheckboxField('m9_voice_control', 'Voice control with Alexa or Siri'),
+    )),
+    MilestoneGroup('m10', 'Milestone 10 - Handover', (
+        CheckboxField('m10_handover', 'Commissioning, programming, handover and 1 year service'),
+    )),
+)
+
+# Descriptive columns returned for every grid row, in response order
+GRID_FIELDS = (
+    GridField('id', int),
+    GridField('project_id', str),
+    GridField('project_name', str),
+    GridField('branch', str, editable=True),
+    GridField('priority', str, editable=True),
+    GridField('sales_team', Optional[str], editable=True),
+    GridField('immediate_action', Optional[str], editable=True),
+    GridField('site_engineer', Optional[str], editable=True),
+    GridField('ongoing_milestone', Optional[str], editable=True),
+    GridField('upcoming_milestone', Optional[str], editable=True),
+    GridField('owner', Optional[str], editable=True),
+    GridField('progress_pct', float, editable=True),
+    GridField('status', str, editable=True),
+)
+
+# =========================
+# DERIVED LOOKUPS (built once at import)
+# =========================
+
+CHECKBOXES = {f.name: f for group in MILESTONE_GROUPS for f in group.fields}
+EDITABLE_FIELDS = {f.name: f for f in GRID_FIELDS if f.editable}
+TOTAL_WEIGHT = sum(f.weight for f in CHECKBOXES.values())
+
+if set(CHECKBOXES) != set(milestone_bits.CHECKBOX_FIELDS):
+    raise RuntimeError("milestone_schema checkboxes do not match the current milestone_bits layout")
+
+# Per-byte weight tables over the bitmask: _BYTE_WEIGHTS[k][b] is the total
+# weight of the checkboxes set in byte value b at byte offset k.
+_BYTE_WEIGHTS = []
+for _offset in range(0, len(milestone_bits.CHECKBOX_FIELDS), 8):
+    _fields = milestone_bits.CHECKBOX_FIELDS[_offset:_offset + 8]
+    _BYTE_WEIGHTS.append(tuple(
+        sum(CHECKBOXES[f].weight for i, f in enumerate(_fields) if b >> i & 1)
+        for b in range(256)
+    ))
+
+
+def is_checkbox_field(field: str) -> bool:
+    return field in CHECKBOXES
+
+
+def completed_weight(bits: int) -> int:
+    return sum(table[bits >> (8 * k) & 0xFF] for k, table in enumerate(_BYTE_WEIGHTS))
+
+
+def progress_from_bits(bits: int) -> int:
+    """Weighted completion percentage for a current-layout checkbox bitmask."""
+    if TOTAL_WEIGHT == 0:
+        return 0
+    return round(completed_weight(bits) / TOTAL_WEIGHT * 100)
+
+
+def coerce_value(field: str, value: Any) -> Any:
+    """Validate a cell edit for a descriptive field and return the value to store.
+    Raises ValueError for unknown or read-only fields and for bad values.
+    """
+    spec = EDITABLE_FIELDS.get(field)
+    if spec is None:
+        raise ValueError(f"Unknown or read-only field: {field}")
+    if value is None:
+        if spec.type in (str, float):
+            raise ValueError(f"Field {field} cannot be empty")
+        return None
+    if spec.type is float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid value for {field}: {value!r}")
+    return str(value)
+
+
+def matrix_header() -> dict:
+    """Describes the columns of matrix-format grid rows (sent once per response)."""
+    return {
+        "format": "matrix",
+        "fields": [f.name for f in GRID_FIELDS],
+        "checkboxes": list(milestone_bits.CHECKBOX_FIELDS),
+        "layout_version": milestone_bits.CURRENT_LAYOUT_VERSION,
+        "bits_encoding": "base64-le",
+    }
+
+
+def matrix_rows(rows) -> list:
+    """Grid rows as lists: the GRID_FIELDS values followed by the base64 checkbox bitmask."""
+    names = [f.name for f in GRID_FIELDS]
+    return [
+        [getattr(row, name) for name in names] + [milestone_bits.to_base64(milestone_bits.read_bits(row))]
+        for row in rows
+    ]
+
+
+def response_model(name: str):
+    """Pydantic response model with one attribute per GRID_FIELDS entry."""
+    fields = {f.name: (f.type, ...) for f in GRID_FIELDS}
+    return create_model(name, __config__=ConfigDict(from_attributes=True), **fields)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Boolean, DateTime, ForeignKey, Text, JSON, Index
 from database import Base
 from datetime import datetime
 from typing import Optional
@@ -14,6 +14,7 @@ class User(Base):
     role = Column(String, nullable=False)  # Admin, PM, Designer, Purchase, Finance, RegionHead
     region = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
+    token_version = Column(Integer, nullable=False, default=0)  # bumped to revoke issued tokens, see principal.py
     created_at = Column(DateTime, default=datetime.utcnow)
 
 # Project Model
@@ -52,6 +53,9 @@ class Milestone(Base):
 # Scope Item Model
 class ScopeItem(Base):
     __tablename__ = "scope_items"
+    __table_args__ = (
+        Index("ix_scope_items_project_id_milestone_id", "project_id", "milestone_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
@@ -78,6 +82,10 @@ class ScopeItem(Base):
 # Issue Model
 class Issue(Base):
     __tablename__ = "issues"
+    __table_args__ = (
+        Index("ix_issues_project_id_created_at", "project_id", "created_at"),
+        Index("ix_issues_created_at_id", "created_at", "id"),  # unfiltered list, newest first
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
@@ -93,6 +101,9 @@ class Issue(Base):
 # Document Model
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_project_id_type_created_at", "project_id", "type", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
@@ -134,6 +145,9 @@ class PurchaseOrder(Base):
 # Design Deliverable Model
 class DesignDeliverable(Base):
     __tablename__ = "design_deliverables"
+    __table_args__ = (
+        Index("ix_design_deliverables_project_id_type_created_at", "project_id", "type", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
@@ -147,6 +161,9 @@ class DesignDeliverable(Base):
 # Notification Model
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_id_read_created_at", "user_id", "read", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -158,6 +175,10 @@ class Notification(Base):
 # Activity Log Model
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        Index("ix_activity_logs_user_id_action_created_at", "user_id", "action", "created_at"),
+        Index("ix_activity_logs_project_id_created_at", "project_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
@@ -173,6 +194,7 @@ class MilestoneGrid(Base):
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(String, nullable=False, unique=True)
     project_name = Column(String, nullable=False)
+    project_fk = Column(Integer, ForeignKey("projects.id"), nullable=True, index=True)
     branch = Column(String, nullable=False)
     priority = Column(String, default="Low")
     sales_team = Column(String, nullable=True)
@@ -250,8 +272,14 @@ class MilestoneGrid(Base):
     # Milestone 10 - Handover
     m10_handover = Column(Boolean, default=False)
     
+    # Bit-packed copy of the checkboxes above (layout in milestone_bits.py)
+    checkbox_bits = Column(BigInteger, nullable=True)  # 44 bits: needs BIGINT outside SQLite
+    checkbox_bits_version = Column(Integer, nullable=True)
+    
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, index=True)
+    # Commit-ordered change counter for delta sync (see table_versions.py)
+    change_seq = Column(BigInteger, nullable=True, index=True)
 
 # Site Execution Milestone Grid Model (same structure as MilestoneGrid but separate table)
 class SiteExecutionMilestoneGrid(Base):
@@ -260,6 +288,7 @@ class SiteExecutionMilestoneGrid(Base):
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(String, nullable=False, unique=True)
     project_name = Column(String, nullable=False)
+    project_fk = Column(Integer, ForeignKey("projects.id"), nullable=True, index=True)
     branch = Column(String, nullable=False)
     priority = Column(String, default="Low")
     sales_team = Column(String, nullable=True)
@@ -337,6 +366,47 @@ class SiteExecutionMilestoneGrid(Base):
     # Milestone 10 - Handover
     m10_handover = Column(Boolean, default=False)
     
+    # Bit-packed copy of the checkboxes above (layout in milestone_bits.py)
+    checkbox_bits = Column(BigInteger, nullable=True)  # 44 bits: needs BIGINT outside SQLite
+    checkbox_bits_version = Column(Integer, nullable=True)
+    
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, index=True)
+    # Commit-ordered change counter for delta sync (see table_versions.py)
+    change_seq = Column(BigInteger, nullable=True, index=True)
+
+# Grid Tombstone Model (rows deleted from either milestone grid, for delta sync)
+class GridTombstone(Base):
+    __tablename__ = "grid_tombstones"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tracker = Column(String, nullable=False, index=True)  # milestone_grid, site_execution_milestone_grid
+    row_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow, index=True)
+    change_seq = Column(BigInteger, nullable=True)  # from the tracker table's counter
+
+    __table_args__ = (
+        Index("ix_grid_tombstones_tracker_change_seq", "tracker", "change_seq"),
+    )
+
+# Table Version Model (write counter per table, used for ETags on read endpoints)
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+# Schema Version Model (one row per applied migration, see migrations.py)
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+# ID Sequence Model (named counters handed out atomically, see project_ids.py)
+class IdSequence(Base):
+    __tablename__ = "id_sequences"
 
+    name = Column(String, primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,105 @@
+"""
+bcrypt password hashing on a dedicated, bounded process pool.
+
+bcrypt is deliberately slow. Run in the request threadpool, a burst of logins
+takes every worker thread and the CPU, and unrelated requests queue behind it.
+The async helpers here send the work to at most BCRYPT_WORKERS processes and
+admit at most BCRYPT_QUEUE_LIMIT hashes in flight (running or waiting); beyond
+that they raise HashingBusy, which the server answers with 503 + Retry-After.
+BCRYPT_WORKERS=0 runs bcrypt in the request threadpool instead, as before.
+
+BCRYPT_ROUNDS sets the work factor for new hashes. Stored hashes carry their
+own cost, so changing it never breaks existing passwords; login rehashes a
+password whose cost differs (see needs_rehash).
+
+Workers are started with "spawn": they import this module (keep it free of
+server, database and model imports) and re-import the main script, so scripts
+that hash through the pool need an `if __name__ == "__main__":` guard.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+from starlette.concurrency import run_in_threadpool
+
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.environ.get("BCRYPT_WORKERS", str(max(1, (os.cpu_count() or 1) // 2))))
+BCRYPT_QUEUE_LIMIT = int(os.environ.get("BCRYPT_QUEUE_LIMIT", "32"))
+
+
+class HashingBusy(Exception):
+    """Too many password hashes are already queued"""
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+def hash_rounds(hashed: str) -> int:
+    """Work factor stored in a bcrypt hash ($2b$<rounds>$...)"""
+    return int(hashed.split("$")[2])
+
+
+def needs_rehash(hashed: str) -> bool:
+    return hash_rounds(hashed) != BCRYPT_ROUNDS
+
+
+_executor = None
+_in_flight = 0
+_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            # spawn: forking a server process that already runs threads is unsafe
+            _executor = ProcessPoolExecutor(BCRYPT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+async def _run(fn, *args):
+    global _in_flight
+    if BCRYPT_WORKERS <= 0:
+        return await run_in_threadpool(fn, *args)
+    with _lock:
+        if _in_flight >= BCRYPT_QUEUE_LIMIT:
+            raise HashingBusy()
+        _in_flight += 1
+    try:
+        return await asyncio.wrap_future(_get_executor().submit(fn, *args))
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); start a fresh pool for later calls
+        shutdown()
+        raise
+    finally:
+        with _lock:
+            _in_flight -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run(hash_password, password, BCRYPT_ROUNDS)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await _run(verify_password, password, hashed)
+
+
+def pool_stats() -> dict:
+    return {"workers": BCRYPT_WORKERS, "queue_limit": BCRYPT_QUEUE_LIMIT, "in_flight": _in_flight, "rounds": BCRYPT_ROUNDS}
+
+
+def shutdown() -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,153 @@
+"""
+Claims-only identity for endpoints that need just who the caller is.
+
+Tokens carry the user's id, email, display name, role, region and token
+version (`tv`), so get_principal can authenticate a request from the token
+alone, without a session or a query. The trade-off is staleness: a token
+keeps the claims it was issued with. To bound that, any change to a user's
+email, name, role, region or active flag bumps users.token_version, and the
+in-memory revocation table below rejects tokens issued before the bump.
+
+The table holds, per user, the lowest token version still accepted. This
+process updates it when its own commits bump a version or delete a user;
+refresh() reloads every user's version and active flag from the database, so
+changes made by other server instances or scripts apply within
+REVOCATION_REFRESH_SECONDS. That includes users deleted or deactivated with
+plain SQL: tokens of a user whose row is gone, or whose is_active is false,
+are rejected after the next refresh.
+"""
+import os
+import sys
+import threading
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from models import User
+
+REVOCATION_REFRESH_SECONDS = float(os.environ.get("REVOCATION_REFRESH_SECONDS", "30"))
+
+# Changing any of these invalidates the claims in tokens already issued
+CLAIM_ATTRIBUTES = ("email", "full_name", "role", "region", "is_active")
+
+
+class Principal(NamedTuple):
+    id: int
+    email: str
+    full_name: str
+    role: str
+    region: Optional[str]
+    token_version: int
+
+
+def token_claims(user: User) -> dict:
+    """The principal claims to put in a new token for `user`"""
+    _seen.add(user.id)
+    return {
+        "user_id": user.id,
+        "email": user.email,
+        "name": user.full_name,
+        "role": user.role,
+        "region": user.region,
+        "tv": user.token_version or 0,
+    }
+
+
+_min_version = {}  # user id -> lowest token version still accepted
+_seen = set()  # ids of the users this process has issued or accepted tokens for
+_lock = threading.Lock()
+
+
+def revoke_before(user_id: int, version: int) -> None:
+    with _lock:
+        _min_version[user_id] = max(version, _min_version.get(user_id, 0))
+
+
+def _reuse(user_id: int, version: int) -> bool:
+    """A new row took the id of a deleted user (SQLite reuses the highest id):
+    accept its tokens again from `version`. Call with _lock held."""
+    if _min_version.get(user_id) != sys.maxsize:
+        return False
+    _min_version[user_id] = version
+    return True
+
+
+def is_revoked(user_id: int, version: int) -> bool:
+    return version < _min_version.get(user_id, 0)
+
+
+def principal_from_claims(claims: dict) -> Optional[Principal]:
+    """The Principal for verified token claims, or None if the token predates
+    principal claims or has been revoked"""
+    if "tv" not in claims:
+        return None
+    user_id = claims["user_id"]
+    if is_revoked(user_id, claims["tv"]):
+        return None
+    _seen.add(user_id)
+    return Principal(user_id, claims["email"], claims["name"], claims["role"], claims.get("region"), claims["tv"])
+
+
+def refresh(db: Session) -> list:
+    """Reload token versions from the database (one query over users).
+    Users that are inactive lose the tokens issued at their current version;
+    users this process has seen whose row is gone lose all of them, until a new
+    row reuses the id. Returns the ids whose lowest accepted version changed.
+    """
+    # Snapshot before the query: every id seen by now belongs to a committed row
+    seen = _seen.copy()
+    floors = {
+        user_id: (version or 0) + (1 if is_active is False else 0)
+        for user_id, version, is_active in db.execute(select(User.id, User.token_version, User.is_active))
+    }
+    for user_id in seen - floors.keys():
+        floors[user_id] = sys.maxsize
+    changed = []
+    with _lock:
+        for user_id, floor in floors.items():
+            if floor > _min_version.get(user_id, 0):
+                _min_version[user_id] = floor
+                changed.append(user_id)
+            elif floor < sys.maxsize and _reuse(user_id, floor):
+                changed.append(user_id)
+    return changed
+
+
+@event.listens_for(User, "before_update")
+def _bump_token_version(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in CLAIM_ATTRIBUTES):
+        target.token_version = (target.token_version or 0) + 1
+        session = Session.object_session(target)
+        if session is not None:
+            session.info.setdefault("revoked_token_versions", {})[target.id] = target.token_version
+
+
+@event.listens_for(User, "after_delete")
+def _revoke_deleted(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("revoked_token_versions", {})[target.id] = sys.maxsize
+
+
+@event.listens_for(User, "after_insert")
+def _reuse_deleted_id(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("inserted_users", {})[target.id] = target.token_version or 0
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_revocations(session):
+    for user_id, version in session.info.pop("inserted_users", {}).items():
+        with _lock:
+            _reuse(user_id, version)
+    for user_id, version in session.info.pop("revoked_token_versions", {}).items():
+        revoke_before(user_id, version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_revocations(session):
+    session.info.pop("inserted_users", None)
+    session.info.pop("revoked_token_versions", None)
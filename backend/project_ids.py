@@ -0,0 +1,84 @@
+"""
+Allocation of TAPL### project IDs for the milestone grids.
+
+Numbers come from a counter that is advanced in a single statement, so
+concurrent project creates can never be handed the same ID. On Postgres the
+counter is a native sequence (nextval); elsewhere it is a row in the
+`id_sequences` table advanced with UPDATE ... RETURNING, which holds the row's
+write lock until the surrounding transaction commits. Migration 8 in
+migrations.py creates the counter starting after the highest existing ID.
+"""
+import re
+
+from sqlalchemy import select, text, update, union_all
+from sqlalchemy.orm import Session
+
+from models import IdSequence, MilestoneGrid, SiteExecutionMilestoneGrid
+
+TAPL_SEQUENCE = "tapl_project_id"
+TAPL_PATTERN = re.compile(r"^TAPL(\d+)$")
+
+_sequences = IdSequence.__table__
+
+
+def format_project_id(number: int) -> str:
+    return f"TAPL{str(number).zfill(3)}"
+
+
+def next_value(db: Session, name: str) -> int:
+    """Advance the named counter and return its new value"""
+    if db.get_bind().dialect.name == "postgresql":
+        return db.execute(text(f"SELECT nextval('{name}_seq')")).scalar_one()
+    stmt = (
+        update(_sequences)
+        .where(_sequences.c.name == name)
+        .values(last_value=_sequences.c.last_value + 1)
+    )
+    if db.get_bind().dialect.update_returning:
+        return db.execute(stmt.returning(_sequences.c.last_value)).scalar_one()
+    # No RETURNING (MySQL): the UPDATE's row lock keeps the follow-up read ours
+    db.execute(stmt)
+    return db.execute(select(_sequences.c.last_value).where(_sequences.c.name == name)).scalar_one()
+
+
+def project_id_taken(db: Session, project_id: str) -> bool:
+    query = union_all(
+        select(MilestoneGrid.id).where(MilestoneGrid.project_id == project_id),
+        select(SiteExecutionMilestoneGrid.id).where(SiteExecutionMilestoneGrid.project_id == project_id),
+    )
+    return db.execute(query.limit(1)).first() is not None
+
+
+def allocate_project_id(db: Session, requested: str = None) -> str:
+    """The requested ID if it is free in both grids, otherwise the next TAPL### ID.
+    Skips numbers a grid row was manually given, so the loop normally runs once.
+    """
+    if requested:
+        if not project_id_taken(db, requested):
+            return requested
+    while True:
+        project_id = format_project_id(next_value(db, TAPL_SEQUENCE))
+        if not project_id_taken(db, project_id):
+            return project_id
+
+
+def highest_project_number(conn) -> int:
+    numbers = [0]
+    for model in (MilestoneGrid, SiteExecutionMilestoneGrid):
+        for (project_id,) in conn.execute(select(model.project_id)):
+            match = TAPL_PATTERN.match(project_id or "")
+            if match:
+                numbers.append(int(match.group(1)))
+    return max(numbers)
+
+
+def create_sequence(conn) -> None:
+    """Create the TAPL counter so the next ID follows the highest one in use"""
+    last = highest_project_number(conn)
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {TAPL_SEQUENCE}_seq START WITH {last + 1}"))
+        return
+    _sequences.create(conn, checkfirst=True)
+    exists = conn.execute(select(_sequences.c.name).where(_sequences.c.name == TAPL_SEQUENCE)).first()
+    if not exists:
+        conn.execute(_sequences.insert().values(name=TAPL_SEQUENCE, last_value=last))
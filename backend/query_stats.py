@@ -0,0 +1,170 @@
+"""
+Per-request SQL instrumentation.
+
+Engine-level cursor events count every statement and time it. The totals are
+attributed to the HTTP request being served through a context variable that
+the server middleware sets per request; the middleware reports them in a
+`Server-Timing` header and folds them into per-route aggregates (served at
+/api/admin/query-stats).
+
+A request that runs the same SQL text SQL_REPEAT_WARN times or more is logged
+as a likely N+1 query.
+
+Tests can bound the number of statements an endpoint issues:
+
+    from query_stats import assert_max_queries
+
+    with assert_max_queries(4):
+        client.get("/api/projects", headers=auth)
+"""
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SQL_REPEAT_WARN = int(os.environ.get("SQL_REPEAT_WARN", "10"))
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.db_time += elapsed
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int = SQL_REPEAT_WARN) -> list:
+        """Statements run at least `threshold` times, most frequent first"""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar("request_query_stats", default=None)
+
+# Captures opened by assert_max_queries(); they see statements from every thread
+_captures = []
+_captures_lock = threading.Lock()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if _captures:
+        with _captures_lock:
+            for capture in _captures:
+                capture.record(statement, elapsed)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def begin_request():
+    """Start counting for the current request; returns a token for end_request()"""
+    stats = QueryStats()
+    return stats, _request_stats.set(stats)
+
+
+def end_request(token) -> None:
+    _request_stats.reset(token)
+
+
+def server_timing(stats: QueryStats, total: float) -> str:
+    return f'db;dur={stats.db_time * 1000:.2f};desc="{stats.count} queries", app;dur={total * 1000:.2f}'
+
+
+class RouteStats:
+    """Per-route aggregates of request count, query count and DB time"""
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def add(self, route: str, stats: QueryStats, total: float) -> None:
+        with self._lock:
+            entry = self._routes.setdefault(route, {
+                "requests": 0, "queries": 0, "max_queries": 0,
+                "db_time": 0.0, "max_db_time": 0.0, "total_time": 0.0,
+            })
+            entry["requests"] += 1
+            entry["queries"] += stats.count
+            entry["max_queries"] = max(entry["max_queries"], stats.count)
+            entry["db_time"] += stats.db_time
+            entry["max_db_time"] = max(entry["max_db_time"], stats.db_time)
+            entry["total_time"] += total
+
+    def snapshot(self) -> list:
+        """Routes ordered by total queries, with per-request averages in ms"""
+        with self._lock:
+            routes = [(route, dict(entry)) for route, entry in self._routes.items()]
+        report = []
+        for route, e in sorted(routes, key=lambda item: item[1]["queries"], reverse=True):
+            n = e["requests"]
+            report.append({
+                "route": route,
+                "requests": n,
+                "queries": e["queries"],
+                "avg_queries": round(e["queries"] / n, 2),
+                "max_queries": e["max_queries"],
+                "db_time_total_ms": round(e["db_time"] * 1000, 2),
+                "db_time_avg_ms": round(e["db_time"] * 1000 / n, 2),
+                "db_time_max_ms": round(e["max_db_time"] * 1000, 2),
+                "time_avg_ms": round(e["total_time"] * 1000 / n, 2),
+            })
+        return report
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+route_stats = RouteStats()
+
+
+def finish_request(route: str, stats: QueryStats, total: float) -> None:
+    """Record a finished request and warn about likely N+1 queries"""
+    route_stats.add(route, stats, total)
+    for statement, n in stats.repeated():
+        logger.warning(f"Possible N+1 in {route}: same statement ran {n} times: {' '.join(statement.split())[:200]}")
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """Fail with AssertionError if the block runs more than `limit` statements.
+
+    Counts statements from every thread (a TestClient request is served on
+    another thread), so only use it where nothing else is querying concurrently.
+    """
+    capture = QueryStats()
+    with _captures_lock:
+        _captures.append(capture)
+    try:
+        yield capture
+    finally:
+        with _captures_lock:
+            _captures.remove(capture)
+    if capture.count > limit:
+        listing = "\n".join(f"  {n}x {' '.join(sql.split())}" for sql, n in capture.statements.most_common())
+        raise AssertionError(f"{capture.count} queries executed, expected at most {limit}:\n{listing}")
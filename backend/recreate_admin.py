@@ -1,12 +1,14 @@
 """
 Script to recreate the admin user if it doesn't exist.
+The new row may reuse the id of a deleted admin (SQLite reuses the highest id),
+so it starts at a token version above any the old row reached: tokens issued
+to the old admin stay revoked once running servers refresh their revocations
+(REVOCATION_REFRESH_SECONDS, default 30 seconds; see principal.py).
 """
 from database import get_db
 from models import User
-import bcrypt
-
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+from password_hashing import hash_password
+import table_versions
 
 def recreate_admin():
     """Recreate admin user if it doesn't exist"""
@@ -27,7 +29,9 @@ def recreate_admin():
             password_hash=password_hash,
             role="Admin",
             region="Headquarters",
-            is_active=True
+            is_active=True,
+            # Every token_version bump is a users write, which bumps this counter
+            token_version=table_versions.current(db.connection(), "users") + 1
         )
         db.add(admin)
         db.commit()
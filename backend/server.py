@@ -1,22 +1,42 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, File, UploadFile, Form, Body
+import time
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, File, UploadFile, Form, Body, Request, Response
 import os
-import smtplib
-from email.mime.text import MIMEText
-from fastapi.responses import FileResponse
+import json
+import asyncio
+import base64
+from fastapi.responses import FileResponse, StreamingResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from starlette.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Generic, TypeVar, Union
 from datetime import datetime, timedelta
-import bcrypt
 import jwt
 import logging
 
-from database import get_db, init_db, engine
-from sqlalchemy import text, func, or_
-from models import User, Project, Milestone as MilestoneModel, ScopeItem as ScopeItemModel, MilestoneGrid, SiteExecutionMilestoneGrid, Notification, ActivityLog, MaterialRequest, PurchaseOrder, Issue, DesignDeliverable, Document
+from database import get_routed_db, get_routed_async_db, engine, read_engine, async_engine, async_read_engine, SessionLocal, pool_stats
+from database import READ_METHODS, READ_PRIMARY_COOKIE, READ_YOUR_WRITES_SECONDS
+from sqlalchemy import func, or_, and_, select, update, delete, cast, Numeric
+from models import User, Project, Milestone as MilestoneModel, ScopeItem as ScopeItemModel, MilestoneGrid, SiteExecutionMilestoneGrid, GridTombstone, Notification, ActivityLog, MaterialRequest, PurchaseOrder, Issue, DesignDeliverable, Document
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+import milestone_bits
+import milestone_schema
+import table_versions
+import grid_events
+import query_stats
+import hot_queries
+from user_cache import user_cache
+from token_cache import token_cache
+import principal
+from principal import Principal, token_claims
+import password_hashing
+from password_hashing import hash_password_async, verify_password_async, needs_rehash, HashingBusy
+from project_ids import allocate_project_id
+from migrations import run_migrations, current_version, HEAD_VERSION
 
 # Configure logging
 logging.basicConfig(
@@ -25,13 +45,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize database
-init_db()
+# Cold-start mode (Cloud Run): skip schema work at startup; migrations.py runs
+# once per deploy instead, creating tables and the admin user on a new database
+COLD_START_MODE = os.environ.get("COLD_START_MODE", "0").lower() in ("1", "true", "yes", "on")
 
 # JWT Configuration
 JWT_SECRET = "your-super-secret-key-change-in-production"
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_HOURS = 24
+# Milestone stream tokens only open /api/milestones/stream, so they can go in its URL
+STREAM_TOKEN_AUDIENCE = "milestone-stream"
+STREAM_TOKEN_SECONDS = 60
 
 # Create the main app
 app = FastAPI(title="Tanti Projects API")
@@ -40,6 +64,7 @@ app = FastAPI(title="Tanti Projects API")
 api_router = APIRouter(prefix="/api")
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 # Configure CORS
 # Allow localhost for development and wildcard for Cloud Run
@@ -50,8 +75,47 @@ app.add_middleware(
     allow_origins=allowed_origins,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Grid-Cursor", "Server-Timing"],
 )
 
+# Password hashing pool is full (a login storm): ask the client to retry shortly
+@app.exception_handler(HashingBusy)
+async def hashing_busy_handler(request: Request, exc: HashingBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many sign-ins in progress, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+# Read-your-writes: after a successful write, pin this client's reads to the
+# primary database for a few seconds (see database.get_routed_db)
+@app.middleware("http")
+async def pin_reads_after_write(request: Request, call_next):
+    response = await call_next(request)
+    if request.method not in READ_METHODS and request.method != "OPTIONS" and response.status_code < 400:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE, str(time.time() + READ_YOUR_WRITES_SECONDS),
+            max_age=READ_YOUR_WRITES_SECONDS, httponly=True, samesite="lax"
+        )
+    return response
+
+# Per-request SQL count and DB time (see query_stats.py), reported in a
+# Server-Timing header and aggregated per route for /api/admin/query-stats
+@app.middleware("http")
+async def record_query_stats(request: Request, call_next):
+    started = time.perf_counter()
+    stats, token = query_stats.begin_request()
+    try:
+        response = await call_next(request)
+    finally:
+        query_stats.end_request(token)
+    total = time.perf_counter() - started
+    response.headers["Server-Timing"] = query_stats.server_timing(stats, total)
+    route = request.scope.get("route")
+    if route is not None:
+        query_stats.finish_request(f"{request.method} {route.path}", stats, total)
+    return response
+
 # Serve uploaded files (for downloads)
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
@@ -119,41 +183,17 @@ class ProjectResponse(BaseModel):
     class Config:
         from_attributes = True
 
-class MilestoneGridResponse(BaseModel):
-    id: int
-    project_id: str
-    project_name: str
-    branch: str
-    priority: str
-    sales_team: Optional[str]
-    immediate_action: Optional[str]
-    site_engineer: Optional[str]
-    ongoing_milestone: Optional[str]
-    upcoming_milestone: Optional[str]
-    owner: Optional[str]
-    progress_pct: float
-    status: str
-    
-    class Config:
-        from_attributes = True
+# Grid row schemas for both trackers come from the milestone schema registry
+MilestoneGridResponse = milestone_schema.response_model("MilestoneGridResponse")
+SiteExecutionMilestoneGridResponse = milestone_schema.response_model("SiteExecutionMilestoneGridResponse")
 
-class SiteExecutionMilestoneGridResponse(BaseModel):
-    id: int
-    project_id: str
-    project_name: str
-    branch: str
-    priority: str
-    sales_team: Optional[str]
-    immediate_action: Optional[str]
-    site_engineer: Optional[str]
-    ongoing_milestone: Optional[str]
-    upcoming_milestone: Optional[str]
-    owner: Optional[str]
-    progress_pct: float
-    status: str
-    
-    class Config:
-        from_attributes = True
+class GridCellEdit(BaseModel):
+    row_id: int
+    field: str
+    value: Any = None
+
+class GridBatchUpdate(BaseModel):
+    edits: List[GridCellEdit]
 
 class TaskCreate(BaseModel):
     assignee_id: Optional[int] = None
@@ -229,21 +269,33 @@ class IssueResponse(BaseModel):
 # UTILITY FUNCTIONS
 # =========================
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
-
-def create_token(user_id: int, email: str, role: str) -> str:
+def create_token(user: User) -> str:
     payload = {
-        'user_id': user_id,
-        'email': email,
-        'role': role,
+        **token_claims(user),
         'exp': datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
+def create_stream_token(current: Principal) -> str:
+    payload = {
+        'user_id': current.id,
+        'tv': current.token_version,
+        'aud': STREAM_TOKEN_AUDIENCE,
+        'exp': datetime.utcnow() + timedelta(seconds=STREAM_TOKEN_SECONDS)
+    }
+    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+def verify_stream_token(token: str) -> dict:
+    try:
+        claims = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM], audience=STREAM_TOKEN_AUDIENCE)
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Stream token expired")
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid stream token")
+    if principal.is_revoked(claims['user_id'], claims['tv']):
+        raise HTTPException(status_code=401, detail="Session expired, please sign in again")
+    return claims
+
 def normalize_bool(value: Any) -> bool:
     """Normalize various checkbox representations to a strict boolean.
     Accepts True/False, 1/0, 'true'/'false', '1'/'0', 'yes'/'no', 'on'/'off'.
@@ -257,35 +309,293 @@ def normalize_bool(value: Any) -> bool:
         return v in {"true", "1", "yes", "on"}
     return False
 
-async def get_current_user(
+def apply_grid_cell(row, field: str, value: Any) -> bool:
+    """Apply one {field, value} edit to a grid row.
+    Fields are validated against the milestone schema registry. Checkboxes are
+    written to the row's bitmask; returns True for checkbox edits so the caller
+    knows progress has to be recalculated.
+    """
+    if milestone_schema.is_checkbox_field(field):
+        milestone_bits.write_checkbox(row, field, normalize_bool(value))
+        return True
+    try:
+        value = milestone_schema.coerce_value(field, value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    setattr(row, field, value)
+    return False
+
+def apply_grid_batch(db: Session, model, edits: List[GridCellEdit], sync_projects: bool) -> list:
+    """Apply many cell edits to grid rows of `model` in one transaction.
+    Progress is recalculated once per touched row and, when `sync_projects` is
+    set, the linked projects' progress is refreshed in one statement. Returns the
+    changed rows.
+    """
+    row_ids = {edit.row_id for edit in edits}
+    rows = {r.id: r for r in db.query(model).filter(model.id.in_(row_ids)).all()}
+    missing = row_ids - rows.keys()
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Milestone not found: {sorted(missing)}")
+    
+    now = datetime.utcnow()
+    recalculate = set()
+    progress_changed = set()
+    for edit in edits:
+        if not edit.field:
+            raise HTTPException(status_code=400, detail="Field is required")
+        row = rows[edit.row_id]
+        if apply_grid_cell(row, edit.field, edit.value):
+            recalculate.add(row.id)
+        elif edit.field == 'progress_pct':
+            progress_changed.add(row.id)
+        row.updated_at = now
+    
+    for row_id in recalculate:
+        row = rows[row_id]
+        row.progress_pct = milestone_schema.progress_from_bits(milestone_bits.read_bits(row))
+    
+    if sync_projects and (recalculate or progress_changed):
+        refresh_project_progress(db, [rows[i].project_fk for i in recalculate | progress_changed])
+    
+    return [rows[i] for i in sorted(row_ids)]
+
+def grid_event_batch(tracker: str, rows: list, edits: List[GridCellEdit]) -> list:
+    """Stream events for a committed batch, one per distinct (row, field)."""
+    by_id = {row.id: row for row in rows}
+    cells = dict.fromkeys((edit.row_id, edit.field) for edit in edits)
+    return [grid_events.cell_event(tracker, by_id[row_id], field) for row_id, field in cells]
+
+def refresh_project_progress(db: Session, project_ids=None) -> int:
+    """Recalculate stored Project.progress in one UPDATE.
+    Progress is the average progress_pct of the project's Secondary Sales grid
+    rows or, for projects without grid rows, the average progress of its scope
+    items; a project with neither has progress 0. Called from every write that changes those inputs (pass the affected
+    project ids) so reads can return the stored value; with no ids every project
+    is recalculated. Returns the number of projects updated.
+    """
+    if project_ids is not None:
+        project_ids = {pid for pid in project_ids if pid}
+        if not project_ids:
+            return 0
+    grid_avg = select(func.avg(MilestoneGrid.progress_pct)).where(MilestoneGrid.project_fk == Project.id).scalar_subquery()
+    scope_avg = select(func.avg(ScopeItemModel.progress)).where(ScopeItemModel.project_id == Project.id).scalar_subquery()
+    stmt = update(Project).values(
+        progress=func.round(cast(func.coalesce(grid_avg, scope_avg, 0), Numeric), 2)
+    )
+    if project_ids is not None:
+        stmt = stmt.where(Project.id.in_(project_ids))
+    db.flush()
+    result = db.execute(stmt.execution_options(synchronize_session="fetch"))
+    return result.rowcount
+
+def link_grid_row_to_project(db: Session, row) -> None:
+    """Set project_fk on a manually created grid row from its project name (case-insensitive)."""
+    if row.project_fk or not row.project_name:
+        return
+    project = db.scalar(hot_queries.PROJECT_BY_NAME, {"name": row.project_name})
+    if project:
+        row.project_fk = project.id
+
+# Grid delta-sync cursors: a position in the grid table's change sequence (see
+# table_versions.py), which orders row edits and tombstones by commit, encoded
+# as an opaque string
+def encode_grid_cursor(seq: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"seq": seq}).encode('utf-8')).decode('ascii')
+
+def decode_grid_cursor(cursor: str) -> int:
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))["seq"])
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid grid cursor")
+
+def record_grid_tombstones(db: Session, tracker: str, row_ids) -> None:
+    """Remember deleted grid rows so delta-sync clients can drop them"""
+    now = datetime.utcnow()
+    db.add_all([GridTombstone(tracker=tracker, row_id=row_id, deleted_at=now) for row_id in row_ids])
+
+def grid_cursor(db: Session, model) -> str:
+    """Cursor for a full grid read. Read it before the rows: every change up to it
+    is committed and so in the rows; later ones come back on the next poll."""
+    return encode_grid_cursor(table_versions.current(db, model.__tablename__))
+
+def grid_format_is_matrix(format: Optional[str]) -> bool:
+    if format is None or format == "json":
+        return False
+    if format == "matrix":
+        return True
+    raise HTTPException(status_code=400, detail=f"Unsupported grid format: {format}")
+
+def grid_matrix_response(response: Response, payload: dict) -> Response:
+    """Serialize a matrix-format grid payload directly, keeping headers already set"""
+    return Response(
+        content=json.dumps(payload, separators=(",", ":")),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
+
+def grid_changes_since(db: Session, model, response_model, cursor: str, matrix: bool = False) -> dict:
+    """Rows of `model` changed after `cursor`, plus ids of rows deleted after it.
+    Clients should apply `deleted` before `rows` (a deleted id can be reused by a
+    newer row) and pass `cursor` back on the next poll.
+    """
+    seq = decode_grid_cursor(cursor)
+    # Read first, as in grid_cursor: rows stamped after it are sent again next time
+    next_cursor = grid_cursor(db, model)
+    rows = (
+        db.query(model)
+        .options(*milestone_bits.defer_checkbox_columns(model))
+        .filter(model.change_seq > seq)
+        .order_by(model.change_seq, model.id)
+        .all()
+    )
+    tombstones = (
+        db.query(GridTombstone)
+        .filter(GridTombstone.tracker == model.__tablename__, GridTombstone.change_seq > seq)
+        .order_by(GridTombstone.change_seq, GridTombstone.id)
+        .all()
+    )
+    changes = {
+        "rows": milestone_schema.matrix_rows(rows) if matrix else [response_model.model_validate(r).model_dump() for r in rows],
+        "deleted": [t.row_id for t in tombstones],
+        "cursor": next_cursor,
+    }
+    if matrix:
+        return {**milestone_schema.matrix_header(), **changes}
+    return changes
+
+# List pagination: keyset on (created_at, id), newest first. A page's cursor is
+# the position of its last row; the next page holds the rows strictly after it.
+# Callers that send neither `limit` nor `cursor` get the plain array they always
+# got; sending either returns {"items": [...], "next_cursor": ...}, with
+# next_cursor null on the last page.
+LIST_PAGE_SIZE = 100
+LIST_PAGE_SIZE_MAX = 500
+
+T = TypeVar("T")
+
+class ListPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+def encode_list_cursor(row) -> str:
+    raw = json.dumps([row.created_at.isoformat(), row.id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_list_cursor(cursor: str):
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def paginate(query, model, limit: Optional[int], cursor: Optional[str], serialize, unpaged_limit: Optional[int] = None):
+    """`query` newest first, each row passed through `serialize`: every row as a
+    list (at most unpaged_limit) without limit/cursor, otherwise one page"""
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if limit is None and cursor is None:
+        if unpaged_limit is not None:
+            query = query.limit(unpaged_limit)
+        return [serialize(row) for row in query.all()]
+    if limit is None:
+        limit = LIST_PAGE_SIZE
+    if not 1 <= limit <= LIST_PAGE_SIZE_MAX:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {LIST_PAGE_SIZE_MAX}")
+    if cursor:
+        created_at, row_id = decode_list_cursor(cursor)
+        query = query.filter(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id),
+        ))
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_list_cursor(rows[-1])
+    return {"items": [serialize(row) for row in rows], "next_cursor": next_cursor}
+
+def conditional_get(request: Request, response: Response, db: Session, tables, current_user) -> Optional[Response]:
+    """Set a strong ETag (from the version counters of `tables`) on a read endpoint.
+    Returns a 304 response, which the endpoint should return as-is, when the
+    client's If-None-Match still matches; otherwise None.
+    """
+    etag = table_versions.etag_for(db, tables, request.url.path, request.url.query, current_user.id)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if table_versions.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+async def conditional_get_async(request: Request, response: Response, db: AsyncSession, tables, current_user) -> Optional[Response]:
+    return await db.run_sync(lambda session: conditional_get(request, response, session, tables, current_user))
+
+async def get_current_user_async(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_routed_async_db)
 ):
+    """The caller's full User row (from the user cache, else the endpoint's AsyncSession)"""
+    return await user_from_token_async(db, credentials.credentials)
+
+async def get_principal(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Principal:
+    """The caller's identity from the token claims alone: no session, no query.
+    Use get_current_user_async instead when the endpoint needs the full User row.
+    """
+    return principal_from_token(credentials.credentials)
+
+def principal_from_token(token: str) -> Principal:
+    current = principal.principal_from_claims(decode_token(token))
+    if current is None:
+        raise HTTPException(status_code=401, detail="Session expired, please sign in again")
+    return current
+
+def refresh_revocations() -> None:
+    with SessionLocal() as db:
+        for user_id in principal.refresh(db):
+            user_cache.invalidate(user_id)
+
+async def refresh_revocations_periodically():
+    while True:
+        await asyncio.sleep(principal.REVOCATION_REFRESH_SECONDS)
+        try:
+            await run_in_threadpool(refresh_revocations)
+        except Exception as e:
+            logger.warning(f"Token revocation refresh failed: {e}")
+
+def decode_token(token: str) -> dict:
+    """Verified claims of a bearer token (cached per token until it expires)"""
+    return token_cache.claims(token, verify_token)
+
+def verify_token(token: str) -> dict:
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user = db.query(User).filter(User.id == payload['user_id']).first()
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        return user
+        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+async def user_from_token_async(db: AsyncSession, token: str) -> User:
+    payload = decode_token(token)
+    user = user_cache.get(payload['user_id'])
+    if user is None:
+        user = await db.scalar(hot_queries.USER_BY_ID, {"user_id": payload['user_id']})
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        user_cache.put(user)
+    return user
+
 # =========================
 # AUTH ENDPOINTS
 # =========================
 
 @api_router.post("/auth/register", response_model=UserResponse)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_routed_async_db)):
     # Check if user exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
+    await db.commit()  # return the connection to the pool while bcrypt runs
     
-    # Create user
-    hashed_pw = hash_password(user_data.password)
+    # Create user (bcrypt runs on the password hashing pool, off the event loop)
+    hashed_pw = await hash_password_async(user_data.password)
     new_user = User(
         full_name=user_data.full_name,
         email=user_data.email,
@@ -295,43 +605,54 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     return UserResponse.model_validate(new_user)
 
 @api_router.post("/auth/login")
-def login(login_data: UserLogin, db: Session = Depends(get_db)):
+async def login(login_data: UserLogin, db: AsyncSession = Depends(get_routed_async_db)):
     try:
-        user = db.query(User).filter(User.email == login_data.email).first()
+        user = await db.scalar(select(User).where(User.email == login_data.email))
         if not user:
             raise HTTPException(status_code=401, detail="Invalid credentials")
+        # End the read transaction so the connection goes back to the pool while bcrypt runs
+        await db.commit()
         
-        if not verify_password(login_data.password, user.password_hash):
+        if not await verify_password_async(login_data.password, user.password_hash):
             raise HTTPException(status_code=401, detail="Invalid credentials")
         
-        token = create_token(user.id, user.email, user.role)
+        # Bring the stored hash to the current BCRYPT_ROUNDS
+        if needs_rehash(user.password_hash):
+            try:
+                user.password_hash = await hash_password_async(login_data.password)
+                await db.commit()
+            except HashingBusy:
+                pass  # keep the old hash; a later login will rehash it
+        
+        token = create_token(user)
+        user_cache.put(user)
         
         return {
             "token": token,
             "user": UserResponse.model_validate(user)
         }
-    except HTTPException:
+    except (HTTPException, HashingBusy):
         raise
     except Exception as e:
         logger.error(f"Login error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @api_router.get("/auth/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user_async)):
     return UserResponse.model_validate(current_user)
 
 # =========================
 # PROJECT ENDPOINTS
 # =========================
 
-@api_router.post("/projects", response_model=ProjectResponse)
-def create_project(project_data: ProjectCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def create_project_with_grid_rows(db: Session, project_data: ProjectCreate, user_id: int) -> Project:
+    """Create a project plus its Secondary Sales and Site Execution grid rows in one transaction"""
     new_project = Project(
         name=project_data.name,
         client=project_data.client,
@@ -341,174 +662,119 @@ def create_project(project_data: ProjectCreate, current_user: User = Depends(get
         type=project_data.type,
         start_date=project_data.start_date,
         end_date=project_data.end_date,
-        created_by=current_user.id
+        created_by=user_id
     )
-    
     db.add(new_project)
-    db.commit()
-    db.refresh(new_project)
+    db.flush()
     
-    # Automatically create a milestone grid row for the new project
-    milestone_project_id = None
-    try:
-        # Use provided project_id or generate a unique one (format: TAPL001, TAPL002, etc.)
-        if project_data.project_id:
-            milestone_project_id = project_data.project_id
-            # Check if this ID already exists
-            if db.query(MilestoneGrid).filter(MilestoneGrid.project_id == milestone_project_id).first():
-                logging.warning(f"Project ID '{milestone_project_id}' already exists, generating new one")
-                milestone_project_id = None
-        
-        if not milestone_project_id:
-            existing_count = db.query(MilestoneGrid).count()
-            milestone_project_id = f"TAPL{str(existing_count + 1).zfill(3)}"
-            
-            # Check if this ID already exists, if so, increment
-            while db.query(MilestoneGrid).filter(MilestoneGrid.project_id == milestone_project_id).first():
-                existing_count += 1
-                milestone_project_id = f"TAPL{str(existing_count + 1).zfill(3)}"
-        
-        new_milestone_row = MilestoneGrid(
-            project_id=milestone_project_id,
-            project_name=new_project.name,
-            branch=new_project.region,
-            priority="Low",
-            progress_pct=0.0,
-            status="Active"
-        )
-        db.add(new_milestone_row)
-        db.commit()
-        db.refresh(new_milestone_row)
-        logging.info(f"Created milestone grid row for project '{new_project.name}' with ID '{milestone_project_id}'")
-    except Exception as e:
-        logging.error(f"Failed to create milestone grid row for project '{new_project.name}': {e}")
-        # Don't fail project creation if milestone grid creation fails
-        # Project is already committed, so we just log the error
+    # Use the provided project_id if it is free, otherwise allocate the next TAPL### ID
+    grid_project_id = allocate_project_id(db, project_data.project_id)
+    if project_data.project_id and grid_project_id != project_data.project_id:
+        logging.warning(f"Project ID '{project_data.project_id}' already exists, using '{grid_project_id}'")
     
-    # Also create a Site Execution Milestone Grid row for the new project
-    try:
-        site_exec_project_id = milestone_project_id
-        if not site_exec_project_id:
-            existing_count = db.query(SiteExecutionMilestoneGrid).count()
-            site_exec_project_id = f"TAPL{str(existing_count + 1).zfill(3)}"
-            while db.query(SiteExecutionMilestoneGrid).filter(SiteExecutionMilestoneGrid.project_id == site_exec_project_id).first():
-                existing_count += 1
-                site_exec_project_id = f"TAPL{str(existing_count + 1).zfill(3)}"
-        
-        new_site_exec_row = SiteExecutionMilestoneGrid(
-            project_id=site_exec_project_id,
+    # Both milestone grids get a row for the new project, under the same ID
+    for model in (MilestoneGrid, SiteExecutionMilestoneGrid):
+        grid_row = model(
+            project_id=grid_project_id,
             project_name=new_project.name,
+            project_fk=new_project.id,
             branch=new_project.region,
             priority="Low",
             progress_pct=0.0,
             status="Active"
         )
-        db.add(new_site_exec_row)
-        db.commit()
-        db.refresh(new_site_exec_row)
-        logging.info(f"Created site execution milestone grid row for project '{new_project.name}' with ID '{site_exec_project_id}'")
-    except Exception as e:
-        logging.error(f"Failed to create site execution milestone grid row for project '{new_project.name}': {e}")
-        # Don't fail project creation if site execution milestone grid creation fails
-        # Project is already committed, so we just log the error
+        milestone_bits.store_bits(grid_row, 0)
+        db.add(grid_row)
     
+    db.commit()
+    logging.info(f"Created project '{new_project.name}' with milestone grid rows '{grid_project_id}'")
+    return new_project
+
+@api_router.post("/projects", response_model=ProjectResponse)
+async def create_project(project_data: ProjectCreate, current_user: Principal = Depends(get_principal), db: AsyncSession = Depends(get_routed_async_db)):
+    new_project = await db.run_sync(create_project_with_grid_rows, project_data, current_user.id)
     return ProjectResponse.model_validate(new_project)
 
 @api_router.get("/projects", response_model=List[ProjectResponse])
-def get_projects(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    projects = db.query(Project).all()
-    
-    # Recalculate progress from milestone grid for all projects
-    for project in projects:
-        all_milestones = db.query(MilestoneGrid).filter(
-            func.lower(MilestoneGrid.project_name) == func.lower(project.name)
-        ).all()
-        if all_milestones:
-            avg_progress = sum(m.progress_pct or 0 for m in all_milestones) / len(all_milestones)
-            project.progress = round(avg_progress, 2)
-    
-    db.commit()
+async def get_projects(request: Request, response: Response, current_user: Principal = Depends(get_principal), db: AsyncSession = Depends(get_routed_async_db)):
+    not_modified = await conditional_get_async(request, response, db, ("projects",), current_user)
+    if not_modified is not None:
+        return not_modified
+    # Project.progress is maintained on write (see refresh_project_progress)
+    projects = (await db.scalars(select(Project))).all()
     return [ProjectResponse.model_validate(p) for p in projects]
 
 @api_router.get("/projects/{project_id}", response_model=ProjectResponse)
-def get_project(project_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    project = db.query(Project).filter(Project.id == project_id).first()
+async def get_project(project_id: int, request: Request, response: Response, current_user: Principal = Depends(get_principal), db: AsyncSession = Depends(get_routed_async_db)):
+    not_modified = await conditional_get_async(request, response, db, ("projects",), current_user)
+    if not_modified is not None:
+        return not_modified
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Recalculate progress from Secondary Sales Milestone Grid to ensure it's up-to-date
-    # Use the progress_pct from the milestone grid row that matches this project name
-    milestone_row = db.query(MilestoneGrid).filter(
-        func.lower(MilestoneGrid.project_name) == func.lower(project.name)
-    ).first()
-    if milestone_row:
-        old_progress = project.progress
-        project.progress = round(milestone_row.progress_pct or 0, 2)
-        db.commit()
-        db.refresh(project)
-        logging.info(f"Project '{project.name}': Updated progress from {old_progress}% to {project.progress}% from Secondary Sales Milestone Grid")
-    else:
-        logging.warning(f"Project '{project.name}': No Secondary Sales milestone grid row found matching this project name")
-    
     return ProjectResponse.model_validate(project)
 
 @api_router.delete("/projects/{project_id}")
-def delete_project(
+async def delete_project(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_routed_async_db)
 ):
     """Delete a project and all related data"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
     try:
         # Delete all related records first (cascade delete)
         # Delete scope items
-        db.query(ScopeItemModel).filter(ScopeItemModel.project_id == project_id).delete()
+        await db.execute(delete(ScopeItemModel).where(ScopeItemModel.project_id == project_id))
         
         # Delete milestones
-        db.query(MilestoneModel).filter(MilestoneModel.project_id == project_id).delete()
+        await db.execute(delete(MilestoneModel).where(MilestoneModel.project_id == project_id))
         
         # Delete documents
-        db.query(Document).filter(Document.project_id == project_id).delete()
+        await db.execute(delete(Document).where(Document.project_id == project_id))
         
         # Delete design deliverables
-        db.query(DesignDeliverable).filter(DesignDeliverable.project_id == project_id).delete()
+        await db.execute(delete(DesignDeliverable).where(DesignDeliverable.project_id == project_id))
         
         # Delete issues
-        db.query(Issue).filter(Issue.project_id == project_id).delete()
+        await db.execute(delete(Issue).where(Issue.project_id == project_id))
         
         # Note: MaterialRequest doesn't have project_id, skip it
         
         # Delete activity logs
-        db.query(ActivityLog).filter(ActivityLog.project_id == project_id).delete()
+        await db.execute(delete(ActivityLog).where(ActivityLog.project_id == project_id))
         
-        # Delete milestone grid entries (by project name)
-        db.query(MilestoneGrid).filter(func.lower(MilestoneGrid.project_name) == func.lower(project.name)).delete()
-        db.query(SiteExecutionMilestoneGrid).filter(func.lower(SiteExecutionMilestoneGrid.project_name) == func.lower(project.name)).delete()
+        # Delete milestone grid entries linked to the project (leaving tombstones for delta sync)
+        for model in (MilestoneGrid, SiteExecutionMilestoneGrid):
+            row_ids = (await db.scalars(select(model.id).where(model.project_fk == project_id))).all()
+            if row_ids:
+                await db.execute(delete(model).where(model.id.in_(row_ids)).execution_options(synchronize_session=False))
+                await db.run_sync(record_grid_tombstones, model.__tablename__, row_ids)
         
         # Finally delete the project
-        db.delete(project)
-        db.commit()
+        await db.delete(project)
+        await db.commit()
         
         logging.info(f"Project '{project.name}' (ID: {project_id}) and all related data deleted successfully")
         return {"status": "deleted", "id": project_id, "message": f"Project '{project.name}' deleted successfully"}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logging.error(f"Error deleting project {project_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to delete project: {str(e)}")
 
 @api_router.put("/projects/{project_id}", response_model=ProjectResponse)
-def update_project(
+async def update_project(
     project_id: int,
     update_data: ProjectUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_routed_async_db)
 ):
     """Update project fields (status, etc.)"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -518,9 +784,17 @@ def update_project(
         if value is not None:
             setattr(project, key, value)
     
+    # Keep the display name on linked grid rows in step with a rename
+    if update_dict.get('name'):
+        for model in (MilestoneGrid, SiteExecutionMilestoneGrid):
+            await db.execute(
+                update(model).where(model.project_fk == project.id)
+                .values(project_name=project.name, updated_at=datetime.utcnow())
+            )
+    
     project.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     
     return ProjectResponse.model_validate(project)
 
@@ -528,21 +802,84 @@ def update_project(
 # MILESTONE GRID ENDPOINTS
 # =========================
 
+@api_router.post("/milestones/stream-token")
+async def create_milestone_stream_token(current_user: Principal = Depends(get_principal)):
+    """Short-lived token for opening /milestones/stream?token= from an EventSource"""
+    return {"token": create_stream_token(current_user), "expires_in": STREAM_TOKEN_SECONDS}
+
+@api_router.get("/milestones/stream")
+async def stream_milestone_grid_edits(
+    request: Request,
+    token: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    """Server-sent events with live milestone grid cell edits from all users.
+    Each `cell` event carries {tracker, row_id, field, value, progress_pct}; a
+    `resync` event means the client fell behind and should reload the grid, and
+    a `revoked` event ends the stream when the user's sessions are revoked.
+    EventSource cannot send headers, so browsers pass ?token= with a token from
+    POST /milestones/stream-token (valid for opening a stream only, and only
+    for STREAM_TOKEN_SECONDS); other clients can send the usual bearer header.
+    """
+    if credentials:
+        current = principal_from_token(credentials.credentials)
+        user_id, version = current.id, current.token_version
+    elif token:
+        claims = verify_stream_token(token)
+        user_id, version = claims['user_id'], claims['tv']
+    else:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    subscriber = grid_events.subscribe()
+    return StreamingResponse(
+        grid_events.sse_stream(request, subscriber, lambda: not principal.is_revoked(user_id, version)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @api_router.get("/milestones/grid")
-def get_milestones_grid(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Get all milestones in grid format"""
-    milestones = db.query(MilestoneGrid).all()
+async def get_milestones_grid(request: Request, response: Response, since: Optional[str] = None, format: Optional[str] = None, current_user: Principal = Depends(get_principal), db: AsyncSession = Depends(get_routed_async_db)):
+    """Get all milestones in grid format.
+    The X-Grid-Cursor header can be passed back as `since` to fetch only later changes.
+    With format=matrix, rows are value lists (column order given once in the
+    header) ending in the base64 checkbox bitmask.
+    """
+    matrix = grid_format_is_matrix(format)
+    not_modified = await conditional_get_async(request, response, db, ("milestone_grid", "grid_tombstones"), current_user)
+    if not_modified is not None:
+        return not_modified
+    if since:
+        changes = await db.run_sync(grid_changes_since, MilestoneGrid, MilestoneGridResponse, since, matrix)
+        return grid_matrix_response(response, changes) if matrix else changes
+    response.headers["X-Grid-Cursor"] = await db.run_sync(grid_cursor, MilestoneGrid)
+    milestones = (await db.scalars(select(MilestoneGrid).options(*milestone_bits.defer_checkbox_columns(MilestoneGrid)))).all()
+    if matrix:
+        rows = await db.run_sync(lambda session: milestone_schema.matrix_rows(milestones))
+        return grid_matrix_response(response, {**milestone_schema.matrix_header(), "rows": rows})
     return [MilestoneGridResponse.model_validate(m).model_dump() for m in milestones]
 
+@api_router.put("/milestones/grid/batch")
+async def update_milestone_grid_cells_batch(
+    batch: GridBatchUpdate,
+    current_user: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_routed_async_db)
+):
+    """Update many milestone grid cells in one transaction and return the changed rows"""
+    rows = await db.run_sync(apply_grid_batch, MilestoneGrid, batch.edits, sync_projects=True)
+    result = [MilestoneGridResponse.model_validate(r).model_dump() for r in rows]
+    await db.commit()
+    grid_events.publish(grid_event_batch(grid_events.TRACKER_SECONDARY_SALES, rows, batch.edits))
+    return result
+
 @api_router.put("/milestones/grid/{milestone_id}")
-def update_milestone_grid_cell(
+async def update_milestone_grid_cell(
     milestone_id: int,
     update_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_routed_async_db)
 ):
     """Update a single cell in the milestone grid and recalculate progress"""
-    milestone = db.query(MilestoneGrid).filter(MilestoneGrid.id == milestone_id).first()
+    milestone = await db.scalar(hot_queries.GRID_ROW_BY_ID[MilestoneGrid], {"row_id": milestone_id})
     if not milestone:
         raise HTTPException(status_code=404, detail="Milestone not found")
     
@@ -552,70 +889,57 @@ def update_milestone_grid_cell(
     if not field:
         raise HTTPException(status_code=400, detail="Field is required")
     
-    # Update the field (normalize boolean inputs for checkbox fields)
-    if field.startswith('m'):
-        setattr(milestone, field, normalize_bool(value))
-    else:
-        setattr(milestone, field, value)
+    # Update the field; checkboxes are written to the row's bitmask and
+    # progress is recalculated from it using the registry weights
+    is_checkbox = apply_grid_cell(milestone, field, value)
+    if is_checkbox:
+        milestone.progress_pct = milestone_schema.progress_from_bits(milestone_bits.read_bits(milestone))
     milestone.updated_at = datetime.utcnow()
     
-    # Recalculate progress if milestone field was updated
-    if field.startswith('m'):
-        # Equal-weight across all checkboxes from entry point and milestones 1..10
-        prefixes = ['m_entry_'] + [f"m{i}_" for i in range(1, 11)]
-        keys = [c for c in MilestoneGrid.__table__.columns.keys() if any(c.startswith(p) for p in prefixes)]
-        total = len(keys)
-        completed = sum(1 for k in keys if normalize_bool(getattr(milestone, k)))
-        milestone.progress_pct = round((completed / total * 100) if total > 0 else 0)
+    # Update the linked project's progress (for any milestone-related update)
+    if is_checkbox or field == 'progress_pct':
+        await db.run_sync(refresh_project_progress, [milestone.project_fk])
     
-    # Update project progress based on milestone grid progress (for any milestone-related update)
-    # Use the progress_pct from THIS milestone row directly (not average of all rows)
-    if field.startswith('m') or field == 'progress_pct':
-        # Find project by matching project_name (case-insensitive using func.lower)
-        project = db.query(Project).filter(
-            func.lower(Project.name) == func.lower(milestone.project_name)
-        ).first()
-        if project:
-            # Use the progress_pct from this specific milestone row
-            project.progress = round(milestone.progress_pct or 0, 2)
-            db.commit()
-            db.refresh(project)
-            logging.info(f"Updated project '{project.name}' progress to {project.progress}% from milestone grid row '{milestone.project_id}'")
-    
-    db.commit()
-    db.refresh(milestone)
+    await db.commit()
+    await db.refresh(milestone)
+    grid_events.publish([grid_events.cell_event(grid_events.TRACKER_SECONDARY_SALES, milestone, field)])
     
     return MilestoneGridResponse.model_validate(milestone).model_dump()
 
 @api_router.post("/milestones/grid")
-def create_milestone_grid(
+async def create_milestone_grid(
     milestone_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_routed_async_db)
 ):
     """Create a new milestone grid row"""
     new_milestone = MilestoneGrid(**milestone_data)
+    milestone_bits.sync_from_columns(new_milestone)
+    await db.run_sync(link_grid_row_to_project, new_milestone)
     db.add(new_milestone)
-    db.commit()
-    db.refresh(new_milestone)
+    await db.run_sync(refresh_project_progress, [new_milestone.project_fk])
+    await db.commit()
+    await db.refresh(new_milestone)
     
     return MilestoneGridResponse.model_validate(new_milestone).model_dump()
 
 @api_router.delete("/milestones/grid/{milestone_id}")
-def delete_milestone_grid_row(
+async def delete_milestone_grid_row(
     milestone_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_routed_async_db)
 ):
     try:
-        row = db.query(MilestoneGrid).filter(MilestoneGrid.id == milestone_id).first()
+        row = await db.scalar(hot_queries.GRID_ROW_BY_ID[MilestoneGrid], {"row_id": milestone_id})
         if not row:
             raise HTTPException(status_code=404, detail="Milestone not found")
-        db.delete(row)
-        db.commit()
+        await db.delete(row)
+        await db.run_sync(record_grid_tombstones, MilestoneGrid.__tablename__, [row.id])
+        await db.run_sync(refresh_project_progress, [row.project_fk])
+        await db.commit()
         return {"status": "deleted", "id": milestone_id}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logging.error(f"Error deleting milestone grid row {milestone_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to delete row: {str(e)}")
 
@@ -624,25 +948,53 @@ def delete_milestone_grid_row(
 # =========================
 
 @api_router.get("/milestones/site-execution-grid")
-def get_site_execution_milestones_grid(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Get all site execution milestones in grid format"""
+async def get_site_execution_milestones_grid(request: Request, response: Response, since: Optional[str] = None, format: Optional[str] = None, current_user: Principal = Depends(get_principal), db: AsyncSession = Depends(get_routed_async_db)):
+    """Get all site execution milestones in grid format.
+    The X-Grid-Cursor header can be passed back as `since` to fetch only later changes.
+    With format=matrix, rows are value lists (column order given once in the
+    header) ending in the base64 checkbox bitmask.
+    """
+    matrix = grid_format_is_matrix(format)
+    not_modified = await conditional_get_async(request, response, db, ("site_execution_milestone_grid", "grid_tombstones"), current_user)
+    if not_modified is not None:
+        return not_modified
+    if since:
+        changes = await db.run_sync(grid_changes_since, SiteExecutionMilestoneGrid, SiteExecutionMilestoneGridResponse, since, matrix)
+        return grid_matrix_response(response, changes) if matrix else changes
     try:
-        milestones = db.query(SiteExecutionMilestoneGrid).all()
+        response.headers["X-Grid-Cursor"] = await db.run_sync(grid_cursor, SiteExecutionMilestoneGrid)
+        milestones = (await db.scalars(select(SiteExecutionMilestoneGrid).options(*milestone_bits.defer_checkbox_columns(SiteExecutionMilestoneGrid)))).all()
+        if matrix:
+            rows = await db.run_sync(lambda session: milestone_schema.matrix_rows(milestones))
+            return grid_matrix_response(response, {**milestone_schema.matrix_header(), "rows": rows})
         result = [SiteExecutionMilestoneGridResponse.model_validate(m).model_dump() for m in milestones]
         return result
     except Exception as e:
         logging.error(f"Error fetching site execution milestones grid: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch site execution milestones grid: {str(e)}")
 
+@api_router.put("/milestones/site-execution-grid/batch")
+async def update_site_execution_milestone_grid_cells_batch(
+    batch: GridBatchUpdate,
+    current_user: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_routed_async_db)
+):
+    """Update many site execution milestone grid cells in one transaction and return the changed rows"""
+    rows = await db.run_sync(apply_grid_batch, SiteExecutionMilestoneGrid, batch.edits, sync_projects=False)
+    result = [SiteExecutionMilestoneGridResponse.model_validate(r).model_dump() for r in rows]
+    await db.commit()
+    grid_events.publish(grid_event_batch(grid_events.TRACKER_SITE_EXECUTION, rows, batch.edits))
+    return result
+
 @api_router.put("/milestones/site-execution-grid/{milestone_id}")
-def update_site_execution_milestone_grid_cell(
+async def update_site_execution_milestone_grid_cell(
     milestone_id: int,
     update_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_routed_async_db)
 ):
     """Update a single cell in the site execution milestone grid and recalculate progress"""
-    milestone = db.query(SiteExecutionMilestoneGrid).filter(SiteExecutionMilestoneGrid.id == milestone_id).first()
+    milestone = await db.scalar(hot_queries.GRID_ROW_BY_ID[SiteExecutionMilestoneGrid], {"row_id": milestone_id})
     if not milestone:
         raise HTTPException(status_code=404, detail="Milestone not found")
     
@@ -652,56 +1004,51 @@ def update_site_execution_milestone_grid_cell(
     if not field:
         raise HTTPException(status_code=400, detail="Field is required")
     
-    # Update the field (normalize boolean inputs for checkbox fields)
-    if field.startswith('m'):
-        setattr(milestone, field, normalize_bool(value))
-    else:
-        setattr(milestone, field, value)
+    # Update the field; checkboxes are written to the row's bitmask and
+    # progress is recalculated from it using the registry weights
+    is_checkbox = apply_grid_cell(milestone, field, value)
+    if is_checkbox:
+        milestone.progress_pct = milestone_schema.progress_from_bits(milestone_bits.read_bits(milestone))
     milestone.updated_at = datetime.utcnow()
     
-    # Recalculate progress if milestone field was updated
-    if field.startswith('m'):
-        # Equal-weight across all checkboxes from entry point and milestones 1..10
-        prefixes = ['m_entry_'] + [f"m{i}_" for i in range(1, 11)]
-        keys = [c for c in SiteExecutionMilestoneGrid.__table__.columns.keys() if any(c.startswith(p) for p in prefixes)]
-        total = len(keys)
-        completed = sum(1 for k in keys if normalize_bool(getattr(milestone, k)))
-        milestone.progress_pct = round((completed / total * 100) if total > 0 else 0)
-    
-    db.commit()
-    db.refresh(milestone)
+    await db.commit()
+    await db.refresh(milestone)
+    grid_events.publish([grid_events.cell_event(grid_events.TRACKER_SITE_EXECUTION, milestone, field)])
     
     return SiteExecutionMilestoneGridResponse.model_validate(milestone).model_dump()
 
 @api_router.post("/milestones/site-execution-grid")
-def create_site_execution_milestone_grid(
+async def create_site_execution_milestone_grid(
     milestone_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_routed_async_db)
 ):
     """Create a new site execution milestone grid row"""
     new_milestone = SiteExecutionMilestoneGrid(**milestone_data)
+    milestone_bits.sync_from_columns(new_milestone)
+    await db.run_sync(link_grid_row_to_project, new_milestone)
     db.add(new_milestone)
-    db.commit()
-    db.refresh(new_milestone)
+    await db.commit()
+    await db.refresh(new_milestone)
     
     return SiteExecutionMilestoneGridResponse.model_validate(new_milestone).model_dump()
 
 @api_router.delete("/milestones/site-execution-grid/{milestone_id}")
-def delete_site_execution_milestone_grid_row(
+async def delete_site_execution_milestone_grid_row(
     milestone_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_routed_async_db)
 ):
     try:
-        row = db.query(SiteExecutionMilestoneGrid).filter(SiteExecutionMilestoneGrid.id == milestone_id).first()
+        row = await db.scalar(hot_queries.GRID_ROW_BY_ID[SiteExecutionMilestoneGrid], {"row_id": milestone_id})
         if not row:
             raise HTTPException(status_code=404, detail="Milestone not found")
-        db.delete(row)
-        db.commit()
+        await db.delete(row)
+        await db.run_sync(record_grid_tombstones, SiteExecutionMilestoneGrid.__tablename__, [row.id])
+        await db.commit()
         return {"status": "deleted", "id": milestone_id}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logging.error(f"Error deleting site execution milestone grid row {milestone_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to delete row: {str(e)}")
 
@@ -710,7 +1057,10 @@ def delete_site_execution_milestone_grid_row(
 # =========================
 
 @api_router.get("/milestones")
-def list_milestones(project_id: Optional[int] = None, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def list_milestones(request: Request, response: Response, project_id: Optional[int] = None, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
+    not_modified = conditional_get(request, response, db, ("milestones",), current_user)
+    if not_modified is not None:
+        return not_modified
     query = db.query(MilestoneModel)
     if project_id is not None:
         query = query.filter(MilestoneModel.project_id == project_id)
@@ -729,7 +1079,10 @@ def list_milestones(project_id: Optional[int] = None, current_user: User = Depen
     ]
 
 @api_router.get("/scope")
-def list_scope_items(project_id: Optional[int] = None, milestone_id: Optional[int] = None, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def list_scope_items(request: Request, response: Response, project_id: Optional[int] = None, milestone_id: Optional[int] = None, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
+    not_modified = conditional_get(request, response, db, ("scope_items",), current_user)
+    if not_modified is not None:
+        return not_modified
     query = db.query(ScopeItemModel)
     if project_id is not None:
         query = query.filter(ScopeItemModel.project_id == project_id)
@@ -752,7 +1105,7 @@ def list_scope_items(project_id: Optional[int] = None, milestone_id: Optional[in
     ]
 
 @api_router.post("/scope")
-def create_scope_item(data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def create_scope_item(data: dict, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
     """Create a new scope item"""
     # CRITICAL: Ensure project_id is always provided
     if 'project_id' not in data or data['project_id'] is None:
@@ -760,6 +1113,7 @@ def create_scope_item(data: dict, current_user: User = Depends(get_current_user)
     
     new_item = ScopeItemModel(**data)
     db.add(new_item)
+    refresh_project_progress(db, [new_item.project_id])
     db.commit()
     db.refresh(new_item)
     return {
@@ -775,7 +1129,7 @@ def create_scope_item(data: dict, current_user: User = Depends(get_current_user)
     }
 
 @api_router.put("/scope/{scope_id}")
-def update_scope_item(scope_id: int, data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def update_scope_item(scope_id: int, data: dict, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
     """Update a scope item"""
     item = db.query(ScopeItemModel).filter(ScopeItemModel.id == scope_id).first()
     if not item:
@@ -796,6 +1150,8 @@ def update_scope_item(scope_id: int, data: dict, current_user: User = Depends(ge
     if not item.project_id and 'project_id' in data:
         item.project_id = data['project_id']
     
+    if 'progress' in data:
+        refresh_project_progress(db, [item.project_id])
     db.commit()
     db.refresh(item)
     return {
@@ -811,12 +1167,13 @@ def update_scope_item(scope_id: int, data: dict, current_user: User = Depends(ge
     }
 
 @api_router.delete("/scope/{scope_id}")
-def delete_scope_item(scope_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def delete_scope_item(scope_id: int, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
     """Delete a scope item"""
     item = db.query(ScopeItemModel).filter(ScopeItemModel.id == scope_id).first()
     if not item:
         raise HTTPException(status_code=404, detail="Scope item not found")
     db.delete(item)
+    refresh_project_progress(db, [item.project_id])
     db.commit()
     return {"status": "deleted", "id": scope_id}
 
@@ -825,7 +1182,10 @@ def delete_scope_item(scope_id: int, current_user: User = Depends(get_current_us
 # =========================
 
 @api_router.get("/dashboard/stats")
-def get_dashboard_stats(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_dashboard_stats(request: Request, response: Response, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
+    not_modified = conditional_get(request, response, db, ("projects",), current_user)
+    if not_modified is not None:
+        return not_modified
     total_projects = db.query(Project).count()
     active_projects = db.query(Project).filter(Project.status == "Active").count()
     completed_projects = db.query(Project).filter(Project.status == "Completed").count()
@@ -859,8 +1219,11 @@ def get_dashboard_stats(current_user: User = Depends(get_current_user), db: Sess
 # =========================
 
 @api_router.get("/projects/summary")
-def get_projects_summary(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_projects_summary(request: Request, response: Response, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
     """Get projects summary for dashboard"""
+    not_modified = conditional_get(request, response, db, ("projects",), current_user)
+    if not_modified is not None:
+        return not_modified
     try:
         total_projects = db.query(Project).count()
         active_projects = db.query(Project).filter(Project.status == "Active").count()
@@ -900,32 +1263,34 @@ def get_projects_summary(current_user: User = Depends(get_current_user), db: Ses
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/activity-logs")
-def get_activity_logs(project_id: Optional[int] = None, limit: int = 20, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_activity_logs(request: Request, response: Response, project_id: Optional[int] = None, limit: Optional[int] = None, cursor: Optional[str] = None, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
+    """Newest activity first; without limit/cursor, the latest 20 as a plain list"""
+    not_modified = conditional_get(request, response, db, ("activity_logs",), current_user)
+    if not_modified is not None:
+        return not_modified
     query = db.query(ActivityLog)
     if project_id is not None:
         query = query.filter(ActivityLog.project_id == project_id)
-    logs = query.order_by(ActivityLog.created_at.desc()).limit(limit).all()
-    return [
-        {
-            "id": l.id,
-            "project_id": l.project_id,
-            "user_id": l.user_id,
-            "action": l.action,
-            "details": l.details,
-            "created_at": l.created_at.isoformat()
-        }
-        for l in logs
-    ]
+    return paginate(query, ActivityLog, limit, cursor, lambda l: {
+        "id": l.id,
+        "project_id": l.project_id,
+        "user_id": l.user_id,
+        "action": l.action,
+        "details": l.details,
+        "created_at": l.created_at.isoformat()
+    }, unpaged_limit=20)
 
 @api_router.get("/notifications")
-def get_notifications(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    notifications = (
-        db.query(Notification)
-        .filter(Notification.user_id == current_user.id)
+async def get_notifications(request: Request, response: Response, current_user: Principal = Depends(get_principal), db: AsyncSession = Depends(get_routed_async_db)):
+    not_modified = await conditional_get_async(request, response, db, ("notifications",), current_user)
+    if not_modified is not None:
+        return not_modified
+    notifications = (await db.scalars(
+        select(Notification)
+        .where(Notification.user_id == current_user.id)
         .order_by(Notification.created_at.desc())
         .limit(10)
-        .all()
-    )
+    )).all()
     return [
         {
             "id": n.id,
@@ -938,11 +1303,13 @@ def get_notifications(current_user: User = Depends(get_current_user), db: Sessio
     ]
 
 @api_router.put("/notifications/mark-read")
-def mark_notifications_read(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    db.query(Notification).filter(
-        Notification.user_id == current_user.id, Notification.read == False
-    ).update({Notification.read: True})
-    db.commit()
+async def mark_notifications_read(current_user: Principal = Depends(get_principal), db: AsyncSession = Depends(get_routed_async_db)):
+    await db.execute(
+        update(Notification)
+        .where(Notification.user_id == current_user.id, Notification.read == False)
+        .values(read=True)
+    )
+    await db.commit()
     return {"message": "All notifications marked as read"}
 
 # =========================
@@ -952,8 +1319,8 @@ def mark_notifications_read(current_user: User = Depends(get_current_user), db:
 @api_router.post("/tasks")
 def create_task(
     task: TaskCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_principal),
+    db: Session = Depends(get_routed_db)
 ):
     """Create a simple task by sending a notification to an assignee.
     This leverages the existing Notification table and shows up in the UI popups.
@@ -986,6 +1353,9 @@ def create_task(
 
 Link: {task.link or '/tasks'}
 """
+        # Imported here: only this rarely used path sends mail
+        import smtplib
+        from email.mime.text import MIMEText
         msg = MIMEText(body)
         msg["Subject"] = subject
         msg["From"] = smtp_from
@@ -1047,40 +1417,41 @@ Link: {task.link or '/tasks'}
 
 @api_router.get("/tasks/assigned-by-me")
 def get_tasks_assigned_by_me(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_principal),
+    db: Session = Depends(get_routed_db)
 ):
     """Return tasks the current user assigned (based on activity logs)."""
-    logs = (
-        db.query(ActivityLog)
-        .filter(ActivityLog.user_id == current_user.id, ActivityLog.action == "assign_task")
-        .order_by(ActivityLog.created_at.desc())
-        .all()
-    )
-    results = []
-    for l in logs:
-        results.append({
-            "id": l.id,
-            "message": l.details,
-            "created_at": l.created_at.isoformat(),
-        })
-    return results
+    not_modified = conditional_get(request, response, db, ("activity_logs",), current_user)
+    if not_modified is not None:
+        return not_modified
+    query = db.query(ActivityLog).filter(ActivityLog.user_id == current_user.id, ActivityLog.action == "assign_task")
+    return paginate(query, ActivityLog, limit, cursor, lambda l: {
+        "id": l.id,
+        "message": l.details,
+        "created_at": l.created_at.isoformat(),
+    })
 
 # =========================
 # MATERIAL REQUESTS
 # =========================
 
-@api_router.get("/material-requests", response_model=List[MaterialRequestResponse])
-def list_material_requests(project_id: Optional[int] = None, mine: Optional[bool] = False, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@api_router.get("/material-requests", response_model=Union[List[MaterialRequestResponse], ListPage[MaterialRequestResponse]])
+def list_material_requests(request: Request, response: Response, project_id: Optional[int] = None, mine: Optional[bool] = False, limit: Optional[int] = None, cursor: Optional[str] = None, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
+    not_modified = conditional_get(request, response, db, ("material_requests",), current_user)
+    if not_modified is not None:
+        return not_modified
     # project_id not used yet as schema doesn't link requests to projects; reserved for future
     query = db.query(MaterialRequest)
     if mine:
         query = query.filter(MaterialRequest.requested_by == current_user.id)
-    requests = query.order_by(MaterialRequest.created_at.desc()).all()
-    return [MaterialRequestResponse.model_validate(r) for r in requests]
+    return paginate(query, MaterialRequest, limit, cursor, MaterialRequestResponse.model_validate)
 
 @api_router.post("/material-requests", response_model=MaterialRequestResponse)
-def create_material_request(req: MaterialRequestCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def create_material_request(req: MaterialRequestCreate, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
     mr = MaterialRequest(
         title=req.title,
         items=req.items,
@@ -1110,7 +1481,7 @@ def create_material_request(req: MaterialRequestCreate, current_user: User = Dep
     return MaterialRequestResponse.model_validate(mr)
 
 @api_router.put("/material-requests/{request_id}", response_model=MaterialRequestResponse)
-def update_material_request(request_id: int, data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def update_material_request(request_id: int, data: dict, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
     mr = db.query(MaterialRequest).filter(MaterialRequest.id == request_id).first()
     if not mr:
         raise HTTPException(status_code=404, detail="Material Request not found")
@@ -1127,16 +1498,18 @@ def update_material_request(request_id: int, data: dict, current_user: User = De
 # PURCHASE ORDERS
 # =========================
 
-@api_router.get("/purchase-orders", response_model=List[PurchaseOrderResponse])
-def list_purchase_orders(mine: Optional[bool] = False, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@api_router.get("/purchase-orders", response_model=Union[List[PurchaseOrderResponse], ListPage[PurchaseOrderResponse]])
+def list_purchase_orders(request: Request, response: Response, mine: Optional[bool] = False, limit: Optional[int] = None, cursor: Optional[str] = None, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
+    not_modified = conditional_get(request, response, db, ("purchase_orders",), current_user)
+    if not_modified is not None:
+        return not_modified
     query = db.query(PurchaseOrder)
     if mine:
         query = query.filter(PurchaseOrder.created_by == current_user.id)
-    orders = query.order_by(PurchaseOrder.created_at.desc()).all()
-    return [PurchaseOrderResponse.model_validate(p) for p in orders]
+    return paginate(query, PurchaseOrder, limit, cursor, PurchaseOrderResponse.model_validate)
 
 @api_router.post("/purchase-orders", response_model=PurchaseOrderResponse)
-def create_purchase_order(po: PurchaseOrderCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def create_purchase_order(po: PurchaseOrderCreate, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
     order = PurchaseOrder(
         title=po.title,
         vendor=po.vendor,
@@ -1156,16 +1529,18 @@ def create_purchase_order(po: PurchaseOrderCreate, current_user: User = Depends(
 # ISSUES
 # =========================
 
-@api_router.get("/issues", response_model=List[IssueResponse])
-def list_issues(project_id: Optional[int] = None, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@api_router.get("/issues", response_model=Union[List[IssueResponse], ListPage[IssueResponse]])
+def list_issues(request: Request, response: Response, project_id: Optional[int] = None, limit: Optional[int] = None, cursor: Optional[str] = None, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
+    not_modified = conditional_get(request, response, db, ("issues",), current_user)
+    if not_modified is not None:
+        return not_modified
     query = db.query(Issue)
     if project_id is not None:
         query = query.filter(Issue.project_id == project_id)
-    issues = query.order_by(Issue.created_at.desc()).all()
-    return [IssueResponse.model_validate(i) for i in issues]
+    return paginate(query, Issue, limit, cursor, IssueResponse.model_validate)
 
 @api_router.post("/issues", response_model=IssueResponse)
-def create_issue(issue_data: IssueCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def create_issue(issue_data: IssueCreate, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
     issue = Issue(
         project_id=issue_data.project_id,
         title=issue_data.title,
@@ -1212,16 +1587,20 @@ class DocumentResponse(BaseModel):
     class Config:
         from_attributes = True
 
-@api_router.get("/design-deliverables", response_model=List[DesignDeliverableResponse])
-def list_design_deliverables(project_id: Optional[int] = None, type: Optional[str] = None, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@api_router.get("/design-deliverables", response_model=Union[List[DesignDeliverableResponse], ListPage[DesignDeliverableResponse]])
+def list_design_deliverables(request: Request, response: Response, project_id: Optional[int] = None, type: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
+    not_modified = conditional_get(request, response, db, ("design_deliverables",), current_user)
+    if not_modified is not None:
+        return not_modified
     try:
         query = db.query(DesignDeliverable)
         if project_id is not None:
             query = query.filter(DesignDeliverable.project_id == project_id)
         if type is not None:
             query = query.filter(DesignDeliverable.type == type)
-        deliverables = query.order_by(DesignDeliverable.created_at.desc()).all()
-        return [DesignDeliverableResponse.model_validate(d) for d in deliverables]
+        return paginate(query, DesignDeliverable, limit, cursor, DesignDeliverableResponse.model_validate)
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error fetching design deliverables: {e}")
         return []
@@ -1231,8 +1610,8 @@ async def upload_design_deliverable(
     file: UploadFile = File(...),
     project_id: str = Form(...),
     deliverable_type: str = Form(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_routed_async_db)
 ):
     try:
         project_id_int = int(project_id)
@@ -1251,8 +1630,7 @@ async def upload_design_deliverable(
         file_path = upload_dir / unique_filename
         
         content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
+        await run_in_threadpool(file_path.write_bytes, content)
     
         # Store a web-friendly relative URL so frontend can open via /uploads
         saved_url = f"uploads/design-deliverables/{unique_filename}"
@@ -1266,28 +1644,32 @@ async def upload_design_deliverable(
             created_at=datetime.utcnow()
         )
         db.add(deliverable)
-        db.commit()
-        db.refresh(deliverable)
+        await db.commit()
+        await db.refresh(deliverable)
         return DesignDeliverableResponse.model_validate(deliverable)
     except Exception as e:
         logging.error(f"Error uploading design deliverable: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to upload design deliverable: {str(e)}")
 
 # =========================
 # DOCUMENTS ENDPOINTS
 # =========================
 
-@api_router.get("/documents", response_model=List[DocumentResponse])
-def list_documents(project_id: Optional[int] = None, type: Optional[str] = None, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@api_router.get("/documents", response_model=Union[List[DocumentResponse], ListPage[DocumentResponse]])
+def list_documents(request: Request, response: Response, project_id: Optional[int] = None, type: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None, current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
+    not_modified = conditional_get(request, response, db, ("documents",), current_user)
+    if not_modified is not None:
+        return not_modified
     try:
         query = db.query(Document)
         if project_id is not None:
             query = query.filter(Document.project_id == project_id)
         if type is not None:
             query = query.filter(Document.type == type)
-        documents = query.all()
-        return [DocumentResponse.model_validate(d) for d in documents]
+        return paginate(query, Document, limit, cursor, DocumentResponse.model_validate)
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error fetching documents: {e}")
         return []
@@ -1297,8 +1679,8 @@ async def upload_document(
     file: UploadFile = File(...),
     project_id: str = Form(...),
     doc_type: str = Form(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_routed_async_db)
 ):
     try:
         project_id_int = int(project_id)
@@ -1317,8 +1699,7 @@ async def upload_document(
         file_path = upload_dir / unique_filename
         
         content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
+        await run_in_threadpool(file_path.write_bytes, content)
     
         # Store a web-friendly relative URL so frontend can open via /uploads
         saved_url = f"uploads/documents/{unique_filename}"
@@ -1332,17 +1713,17 @@ async def upload_document(
             created_at=datetime.utcnow()
         )
         db.add(document)
-        db.commit()
-        db.refresh(document)
+        await db.commit()
+        await db.refresh(document)
         return DocumentResponse.model_validate(document)
     except Exception as e:
         logging.error(f"Error uploading document: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to upload document: {str(e)}")
 
 # Download a design deliverable file by id
 @api_router.get("/design-deliverables/{deliverable_id}/download")
-def download_design_deliverable(deliverable_id: int, db: Session = Depends(get_db)):
+def download_design_deliverable(deliverable_id: int, db: Session = Depends(get_routed_db)):
     deliverable = db.query(DesignDeliverable).filter(DesignDeliverable.id == deliverable_id).first()
     if not deliverable:
         raise HTTPException(status_code=404, detail="Design deliverable not found")
@@ -1358,13 +1739,80 @@ def download_design_deliverable(deliverable_id: int, db: Session = Depends(get_d
     filename = deliverable.name or os.path.basename(file_path)
     return FileResponse(path=file_path, filename=filename)
 
+# =========================
+# ADMIN MAINTENANCE
+# =========================
+
+@api_router.post("/admin/projects/recompute-progress")
+def recompute_all_project_progress(current_user: Principal = Depends(get_principal), db: Session = Depends(get_routed_db)):
+    """Recalculate progress for every project in one bulk UPDATE (repairs drift)"""
+    if current_user.role != "Admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    updated = refresh_project_progress(db)
+    db.commit()
+    logging.info(f"Recomputed progress for {updated} project(s)")
+    return {"status": "ok", "updated": updated}
+
+@api_router.get("/admin/db-pool")
+def get_db_pool_stats(current_user: Principal = Depends(get_principal)):
+    """Live connection pool statistics (checked out, overflow, checkout wait time)"""
+    if current_user.role != "Admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    stats = {"backend": engine.dialect.name, **pool_stats(), "async": pool_stats(async_engine)}
+    if read_engine is not engine:
+        stats["read"] = pool_stats(read_engine)
+        stats["async_read"] = pool_stats(async_read_engine)
+    return stats
+
+@api_router.get("/admin/query-stats")
+def get_query_stats(reset: bool = False, current_user: Principal = Depends(get_principal)):
+    """SQL statements and DB time per route since startup (or the last reset)"""
+    if current_user.role != "Admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    routes = query_stats.route_stats.snapshot()
+    if reset:
+        query_stats.route_stats.reset()
+    return routes
+
+@api_router.get("/admin/user-cache")
+def get_user_cache_stats(clear: bool = False, current_user: Principal = Depends(get_principal)):
+    """Authenticated-user cache size and hit rate; ?clear=true empties it"""
+    if current_user.role != "Admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    stats = user_cache.stats()
+    if clear:
+        user_cache.clear()
+    return stats
+
+@api_router.get("/admin/token-cache")
+def get_token_cache_stats(current_user: Principal = Depends(get_principal)):
+    """Verified-token cache size and hit rate"""
+    if current_user.role != "Admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return token_cache.stats()
+
+@api_router.post("/admin/token-cache")
+def update_token_cache(enabled: Optional[bool] = None, clear: bool = False, current_user: Principal = Depends(get_principal)):
+    """Kill switch: ?enabled=false stops caching (and flushes), ?clear=true flushes"""
+    if current_user.role != "Admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    if enabled is not None:
+        token_cache.set_enabled(enabled)
+    if clear:
+        token_cache.clear()
+    return token_cache.stats()
+
 # =========================
 # HEALTH CHECK ENDPOINT
 # =========================
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok", "message": "Backend server is running"}
+    return {
+        "status": "ok",
+        "message": "Backend server is running",
+        "startup": getattr(app.state, "startup_timing", None),
+    }
 
 # Include the router in the main app (must be after all route definitions)
 app.include_router(api_router)
@@ -1406,42 +1854,50 @@ else:
 
 @app.on_event("startup")
 async def startup_event():
+    started = time.perf_counter()
     logger.info("Starting Tanti Project Management API...")
-    logger.info("Database: SQLite (tanti.db)")
-    # Lightweight migration: ensure new columns exist
-    try:
-        with engine.begin() as conn:
-            cols = conn.execute(text("PRAGMA table_info(material_requests)")).fetchall()
-            names = {c[1] for c in cols}
-            if "assignee_email" not in names:
-                conn.execute(text("ALTER TABLE material_requests ADD COLUMN assignee_email VARCHAR NULL"))
-                logger.info("Added column material_requests.assignee_email")
-    except Exception as e:
-        logger.warning(f"Startup migration skipped or failed: {e}")
+    logger.info(f"Database: {engine.dialect.name} ({engine.url.render_as_string(hide_password=True)})")
+    if COLD_START_MODE:
+        # migrations.py ran at deploy time; only check that it did (one SELECT)
+        try:
+            with engine.connect() as conn:
+                version = current_version(conn)
+            if version < HEAD_VERSION:
+                logger.error(f"Schema at version {version}, expected {HEAD_VERSION}: run python migrations.py")
+        except Exception as e:
+            logger.error(f"Schema version check failed, run python migrations.py: {e}")
+    else:
+        # Apply pending schema migrations (a single SELECT when the schema is current)
+        try:
+            applied = run_migrations(engine)
+            if applied:
+                logger.info(f"Applied schema migration(s) {applied}; schema at version {HEAD_VERSION}")
+        except Exception as e:
+            logger.warning(f"Startup migration skipped or failed: {e}")
     
-    # Create admin user if it doesn't exist
+    # Token revocations (see principal.py): load now, then keep in sync with other instances
     try:
-        db = next(get_db())
-        admin_email = "admin@tantiautomatics.com"
-        admin = db.query(User).filter(User.email == admin_email).first()
-        if not admin:
-            password_hash = hash_password("admin123")
-            admin = User(
-                full_name="Admin User",
-                email=admin_email,
-                password_hash=password_hash,
-                role="Admin",
-                region="Headquarters",
-                is_active=True
-            )
-            db.add(admin)
-            db.commit()
-            logger.info(f"Admin user created: {admin_email}")
-        else:
-            logger.info(f"Admin user already exists: {admin_email}")
-        db.close()
+        refresh_revocations()
     except Exception as e:
-        logger.warning(f"Failed to create admin user: {e}")
+        logger.warning(f"Token revocation load failed: {e}")
+    app.state.revocation_refresher = asyncio.create_task(refresh_revocations_periodically())
+    
+    app.state.startup_timing = {
+        "cold_start_mode": COLD_START_MODE,
+        "import_ms": round(IMPORT_SECONDS * 1000, 1),
+        "startup_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    logger.info(f"Startup complete: import {app.state.startup_timing['import_ms']} ms, "
+                f"startup {app.state.startup_timing['startup_ms']} ms")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    refresher = getattr(app.state, "revocation_refresher", None)
+    if refresher is not None:
+        refresher.cancel()
+    password_hashing.shutdown()
+
+IMPORT_SECONDS = time.perf_counter() - _import_started
 
 if __name__ == "__main__":
     import uvicorn
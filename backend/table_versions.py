@@ -0,0 +1,136 @@
+"""
+Table-level write versions for conditional GETs.
+
+Every ORM flush or bulk UPDATE/DELETE that touches a tracked table bumps that
+table's counter in `table_versions`, inside the same transaction as the write.
+Read endpoints hash the counters of the tables they read into a strong ETag, so
+an unchanged result can be answered with 304 from one small SELECT.
+
+The milestone grid counters double as change sequences for delta sync. A
+flush that writes grid rows (or grid tombstones) first advances the grid
+table's counter and stamps the new value into the rows' change_seq. The
+counter UPDATE holds that row's write lock until commit, so a transaction
+that stamps a later value cannot commit before one that stamped an earlier
+value: change_seq order is commit order, which updated_at (set by the
+application before it waits for the lock) is not.
+"""
+import hashlib
+from sqlalchemy import event, select, update, insert
+from sqlalchemy.orm import Session
+from models import TableVersion, GridTombstone
+
+TRACKED_TABLES = frozenset({
+    "projects",
+    "milestone_grid",
+    "site_execution_milestone_grid",
+    "grid_tombstones",
+    "milestones",
+    "scope_items",
+    "issues",
+    "documents",
+    "design_deliverables",
+    "material_requests",
+    "purchase_orders",
+    "notifications",
+    "activity_logs",
+    "users",
+})
+
+# Tables whose rows carry a change_seq stamped from their counter
+SEQUENCED_TABLES = frozenset({"milestone_grid", "site_execution_milestone_grid"})
+
+_versions = TableVersion.__table__
+
+
+def _bump(connection, tables) -> None:
+    connection.execute(
+        update(_versions)
+        .where(_versions.c.table_name.in_(sorted(tables)))
+        .values(version=_versions.c.version + 1)
+    )
+
+
+def _next_version(connection, table: str) -> int:
+    """Advance one table's counter and return its new value"""
+    stmt = update(_versions).where(_versions.c.table_name == table).values(version=_versions.c.version + 1)
+    if connection.dialect.update_returning:
+        return connection.execute(stmt.returning(_versions.c.version)).scalar_one()
+    # No RETURNING (MySQL): the UPDATE's row lock keeps the follow-up read ours
+    connection.execute(stmt)
+    return current(connection, table)
+
+
+def _sequence_table(obj):
+    """The sequenced table whose counter stamps `obj`, if any"""
+    if isinstance(obj, GridTombstone):
+        return obj.tracker
+    name = obj.__table__.name
+    return name if name in SEQUENCED_TABLES else None
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_change_seq(session, flush_context, instances):
+    stamped = {}
+    for obj in (*session.new, *session.dirty):
+        table = _sequence_table(obj)
+        if table is None:
+            continue
+        if table not in stamped:
+            stamped[table] = _next_version(session.connection(), table)
+        obj.change_seq = stamped[table]
+    # Already advanced for this flush; _bump_after_flush skips them
+    session.info["sequenced_tables"] = set(stamped)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_after_flush(session, flush_context):
+    touched = {obj.__table__.name for obj in (*session.new, *session.dirty, *session.deleted)}
+    touched &= TRACKED_TABLES
+    touched -= session.info.pop("sequenced_tables", set())
+    if touched:
+        _bump(session.connection(), touched)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_on_bulk_write(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is None or table.name not in TRACKED_TABLES:
+            return
+        connection = orm_execute_state.session.connection()
+        if orm_execute_state.is_update and table.name in SEQUENCED_TABLES:
+            seq = _next_version(connection, table.name)
+            orm_execute_state.statement = orm_execute_state.statement.values(change_seq=seq)
+        else:
+            _bump(connection, {table.name})
+
+
+def seed(connection) -> None:
+    """Create a counter row for every tracked table that does not have one yet."""
+    existing = {name for (name,) in connection.execute(select(_versions.c.table_name))}
+    missing = TRACKED_TABLES - existing
+    if missing:
+        connection.execute(insert(_versions), [{"table_name": name, "version": 0} for name in sorted(missing)])
+
+
+def current(connection, table: str) -> int:
+    """A table's counter; for a sequenced table, every change_seq up to it is committed"""
+    return connection.execute(select(_versions.c.version).where(_versions.c.table_name == table)).scalar_one()
+
+
+def etag_for(db: Session, tables, *parts) -> str:
+    """Strong ETag from the current versions of `tables` plus any extra key parts."""
+    versions = db.execute(
+        select(_versions.c.table_name, _versions.c.version)
+        .where(_versions.c.table_name.in_(sorted(tables)))
+        .order_by(_versions.c.table_name)
+    ).all()
+    digest = hashlib.sha1(repr((tuple(versions), parts)).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
@@ -0,0 +1,85 @@
+"""
+Cache of verified JWT claims, keyed by the SHA-256 digest of the token.
+
+A bearer token is sent with every API call, and verifying it (HMAC over the
+token plus JSON claim parsing) gives the same answer each time until it
+expires. Verified claims are kept until the token's `exp`, so each token is
+verified once per process. Tokens without `exp` are never cached. At most
+TOKEN_CACHE_SIZE tokens are held, least recently used evicted first.
+
+Only digests are stored, never the tokens themselves.
+
+Kill switch: TOKEN_CACHE_ENABLED=0 turns the cache off at startup, and
+set_enabled(False) / clear() (POST /api/admin/token-cache) turn it off or
+flush it at runtime, so that a revocation (for example a new JWT secret)
+takes effect immediately instead of when cached tokens expire. revoke()
+drops a single token.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", "4096"))
+TOKEN_CACHE_ENABLED = os.environ.get("TOKEN_CACHE_ENABLED", "1").lower() not in ("0", "false", "no", "off")
+
+
+class TokenCache:
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE, enabled: bool = TOKEN_CACHE_ENABLED):
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self._entries = OrderedDict()  # token digest -> (exp timestamp, claims)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def claims(self, token: str, verify) -> dict:
+        """Claims of `token`, from the cache or by calling verify(token)"""
+        if not self.enabled:
+            return verify(token)
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+        claims = verify(token)
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)) and exp > now:
+            with self._lock:
+                self._entries[key] = (exp, dict(claims))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return claims
+
+    def revoke(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
+        if not enabled:
+            self.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        return {"enabled": self.enabled, "size": size, "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+token_cache = TokenCache()
@@ -0,0 +1,117 @@
+"""
+In-process cache of authenticated users, keyed by user id.
+
+get_current_user_async looks users up here before querying, so repeated API calls
+from the same user cost no SQL. Entries expire after USER_CACHE_TTL_SECONDS
+and the least recently used entry is evicted once USER_CACHE_SIZE users are
+held; USER_CACHE_TTL_SECONDS=0 disables the cache.
+
+The cache holds column values, not ORM instances: every hit builds a fresh
+transient User, so requests never share an object or touch another session.
+
+Writes through this process's ORM invalidate entries (see the listeners at the
+bottom): inserts, updates and deletes of a User drop that id when flushed and
+again after commit, and bulk UPDATE/DELETE statements on users clear the
+cache. Changes made by another process, such as clear_users.py or
+recreate_admin.py, or another server instance, are picked up when the entry's
+TTL runs out.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from models import User
+
+USER_CACHE_TTL_SECONDS = float(os.environ.get("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", "1024"))
+
+_columns = [attr.key for attr in inspect(User).column_attrs]
+
+
+class UserCache:
+    def __init__(self, ttl: float = USER_CACHE_TTL_SECONDS, maxsize: int = USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # user id -> (expires_at, column values)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        """A new transient User for `user_id`, or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            values = entry[1]
+        return User(**values)
+
+    def put(self, user: User) -> None:
+        if self.ttl <= 0:
+            return
+        values = {key: getattr(user, key) for key in _columns}
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        return {"size": size, "maxsize": self.maxsize, "ttl_seconds": self.ttl, "hits": self.hits, "misses": self.misses}
+
+
+user_cache = UserCache()
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_flush(mapper, connection, target):
+    user_cache.invalidate(target.id)
+    # A request reading the old row before we commit could cache it again
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _clear_on_bulk_write(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and table.name == User.__tablename__:
+            user_cache.clear()
+            orm_execute_state.session.info["clear_user_cache"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop("clear_user_cache", False):
+        user_cache.clear()
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session):
+    session.info.pop("clear_user_cache", None)
+    session.info.pop("changed_user_ids", None)
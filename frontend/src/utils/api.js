@@ -96,13 +96,25 @@ export const api = {
 
   // Milestone Grid (Secondary Sales)
   getMilestonesGrid: () => axios.get(`${API_URL}/milestones/grid`, { headers: getAuthHeader() }),
+  getMilestonesGridMatrix: () => axios.get(`${API_URL}/milestones/grid?format=matrix`, { headers: getAuthHeader() }),
   createMilestonesGrid: (data) => axios.post(`${API_URL}/milestones/grid`, data, { headers: getAuthHeader() }),
   updateMilestoneCell: (id, field, value) => axios.put(`${API_URL}/milestones/grid/${id}`, { field, value }, { headers: getAuthHeader() }),
+  updateMilestoneCells: (edits) => axios.put(`${API_URL}/milestones/grid/batch`, { edits }, { headers: getAuthHeader() }),
   deleteMilestonesGrid: (id) => axios.delete(`${API_URL}/milestones/grid/${id}`, { headers: getAuthHeader() }),
 
   // Site Execution Milestone Grid
   getSiteExecutionMilestonesGrid: () => axios.get(`${API_URL}/milestones/site-execution-grid`, { headers: getAuthHeader() }),
+  getSiteExecutionMilestonesGridMatrix: () => axios.get(`${API_URL}/milestones/site-execution-grid?format=matrix`, { headers: getAuthHeader() }),
   createSiteExecutionMilestonesGrid: (data) => axios.post(`${API_URL}/milestones/site-execution-grid`, data, { headers: getAuthHeader() }),
   updateSiteExecutionMilestoneCell: (id, field, value) => axios.put(`${API_URL}/milestones/site-execution-grid/${id}`, { field, value }, { headers: getAuthHeader() }),
-  deleteSiteExecutionMilestonesGrid: (id) => axios.delete(`${API_URL}/milestones/site-execution-grid/${id}`, { headers: getAuthHeader() })
+  updateSiteExecutionMilestoneCells: (edits) => axios.put(`${API_URL}/milestones/site-execution-grid/batch`, { edits }, { headers: getAuthHeader() }),
+  deleteSiteExecutionMilestonesGrid: (id) => axios.delete(`${API_URL}/milestones/site-execution-grid/${id}`, { headers: getAuthHeader() }),
+
+  // Live grid edits (server-sent events: 'cell', 'resync' and 'revoked'). EventSource
+  // cannot send headers, so the URL carries a short-lived stream token rather than
+  // the login token; once the stream closes, open a new one (it needs a new token).
+  openMilestoneStream: async () => {
+    const { data } = await axios.post(`${API_URL}/milestones/stream-token`, {}, { headers: getAuthHeader() });
+    return new EventSource(`${API_URL}/milestones/stream?token=${encodeURIComponent(data.token)}`);
+  }
 };
@@ -0,0 +1,79 @@
+"""
+Shared fixtures: the FastAPI app on a scratch SQLite database.
+
+The environment is set before the backend is imported, so the engines point at
+a temporary directory and bcrypt runs with a low cost in the request threadpool.
+Startup applies the migrations, which create the tables and the admin user.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+WORK_DIR = tempfile.mkdtemp(prefix="tanti_tests_")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'test.db')}"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("BCRYPT_WORKERS", "0")
+os.environ.setdefault("REVOCATION_REFRESH_SECONDS", "3600")
+os.makedirs(os.path.join(WORK_DIR, "uploads"), exist_ok=True)
+os.chdir(WORK_DIR)  # server.py mounts ./uploads
+sys.path.insert(0, BACKEND_DIR)
+
+ADMIN = {"email": "admin@tantiautomatics.com", "password": "admin123"}
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    import server
+
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def auth(client):
+    response = client.post("/api/auth/login", json=ADMIN)
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+@pytest.fixture
+def db():
+    from database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def register_and_login(client, email: str, role: str = "PM") -> dict:
+    """Register a user and return its auth header"""
+    user = {"full_name": "Test User", "email": email, "password": "secret123", "role": role, "region": "Bengaluru"}
+    response = client.post("/api/auth/register", json=user)
+    assert response.status_code == 200, response.text
+    response = client.post("/api/auth/login", json={"email": email, "password": user["password"]})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+def create_project(client, auth, name: str, **fields) -> dict:
+    """Create a project (and its grid rows) through the API"""
+    payload = {
+        "name": name,
+        "client": "Test Client",
+        "region": "Bengaluru",
+        "value": 1000.0,
+        "type": "Residential",
+        "start_date": "2026-01-01T00:00:00",
+        "end_date": "2026-06-01T00:00:00",
+        **fields,
+    }
+    response = client.post("/api/projects", json=payload, headers=auth)
+    assert response.status_code == 200, response.text
+    return response.json()
@@ -0,0 +1,39 @@
+"""ETags on read endpoints: 304 while nothing changed, a new tag after a write, one tag per user."""
+import pytest
+
+from tests.conftest import create_project, register_and_login
+
+# One endpoint served through conditional_get_async and one through conditional_get
+ENDPOINTS = ["/api/projects", "/api/dashboard/stats"]
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_unchanged_resource_returns_304(client, auth, path):
+    first = client.get(path, headers=auth)
+    assert first.status_code == 200, first.text
+    etag = first.headers["ETag"]
+
+    again = client.get(path, headers={**auth, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert again.content == b""
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_etag_changes_after_a_write(client, auth, path):
+    etag = client.get(path, headers=auth).headers["ETag"]
+    create_project(client, auth, f"ETag Write {path}")
+
+    after = client.get(path, headers={**auth, "If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != etag
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_etags_are_scoped_per_user(client, auth, path):
+    other = register_and_login(client, f"etag{ENDPOINTS.index(path)}@example.com")
+    etag = client.get(path, headers=auth).headers["ETag"]
+
+    response = client.get(path, headers={**other, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
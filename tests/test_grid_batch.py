@@ -0,0 +1,75 @@
+"""PUT /api/milestones/grid/batch: all-or-nothing cell edits with project progress sync."""
+import milestone_bits
+from models import MilestoneGrid
+from tests.conftest import create_project
+
+
+def grid_row_for(client, auth, project_name: str) -> dict:
+    grid = client.get("/api/milestones/grid", headers=auth).json()
+    return next(row for row in grid if row["project_name"] == project_name)
+
+
+def checkboxes(db, row_id: int) -> dict:
+    db.expire_all()
+    return milestone_bits.unpack(milestone_bits.read_bits(db.get(MilestoneGrid, row_id)))
+
+
+def batch(client, auth, edits):
+    return client.put("/api/milestones/grid/batch", json={"edits": edits}, headers=auth)
+
+
+def test_batch_applies_every_edit_and_syncs_project_progress(client, auth, db):
+    project = create_project(client, auth, "Batch Apply")
+    row = grid_row_for(client, auth, "Batch Apply")
+
+    response = batch(client, auth, [
+        {"row_id": row["id"], "field": "m1_slab1", "value": True},
+        {"row_id": row["id"], "field": "m10_handover", "value": "true"},
+        {"row_id": row["id"], "field": "owner", "value": "Batch Owner"},
+    ])
+    assert response.status_code == 200, response.text
+    [updated] = response.json()
+    stored_checkboxes = checkboxes(db, row["id"])
+    assert stored_checkboxes["m1_slab1"] and stored_checkboxes["m10_handover"]
+    assert updated["owner"] == "Batch Owner"
+    assert updated["progress_pct"] > 0
+
+    stored = client.get(f"/api/projects/{project['id']}", headers=auth).json()
+    assert stored["progress"] == round(updated["progress_pct"], 2)
+
+
+def test_batch_with_a_bad_cell_changes_nothing(client, auth, db):
+    create_project(client, auth, "Batch Rollback")
+    row = grid_row_for(client, auth, "Batch Rollback")
+
+    response = batch(client, auth, [
+        {"row_id": row["id"], "field": "m1_slab1", "value": True},
+        {"row_id": row["id"], "field": "no_such_field", "value": "x"},
+    ])
+    assert response.status_code == 400
+
+    unchanged = grid_row_for(client, auth, "Batch Rollback")
+    assert not checkboxes(db, row["id"])["m1_slab1"]
+    assert unchanged["progress_pct"] == row["progress_pct"]
+
+
+def test_batch_with_an_unknown_row_is_rejected(client, auth, db):
+    create_project(client, auth, "Batch Missing Row")
+    row = grid_row_for(client, auth, "Batch Missing Row")
+
+    response = batch(client, auth, [
+        {"row_id": row["id"], "field": "m1_slab1", "value": True},
+        {"row_id": 10 ** 9, "field": "m1_slab1", "value": True},
+    ])
+    assert response.status_code == 404
+    assert not checkboxes(db, row["id"])["m1_slab1"]
+
+
+def test_project_progress_resets_when_its_grid_rows_are_deleted(client, auth):
+    project = create_project(client, auth, "Batch Delete Row")
+    row = grid_row_for(client, auth, "Batch Delete Row")
+    assert batch(client, auth, [{"row_id": row["id"], "field": "m1_slab1", "value": True}]).status_code == 200
+    assert client.get(f"/api/projects/{project['id']}", headers=auth).json()["progress"] > 0
+
+    assert client.delete(f"/api/milestones/grid/{row['id']}", headers=auth).status_code == 200
+    assert client.get(f"/api/projects/{project['id']}", headers=auth).json()["progress"] == 0
@@ -0,0 +1,48 @@
+"""Delta sync on the milestone grid: changes are found by commit order, not by updated_at."""
+from datetime import datetime, timedelta
+
+from models import MilestoneGrid
+from tests.conftest import create_project
+
+
+def grid_row_for(client, auth, project_name: str) -> dict:
+    grid = client.get("/api/milestones/grid", headers=auth).json()
+    return next(row for row in grid if row["project_name"] == project_name)
+
+
+def test_delta_returns_edits_and_deletes_after_the_cursor(client, auth):
+    create_project(client, auth, "Delta Sync Edit")
+    row = grid_row_for(client, auth, "Delta Sync Edit")
+    cursor = client.get("/api/milestones/grid", headers=auth).headers["X-Grid-Cursor"]
+
+    response = client.get("/api/milestones/grid", params={"since": cursor}, headers=auth)
+    assert response.json()["rows"] == []
+
+    client.put(f"/api/milestones/grid/{row['id']}", json={"field": "m1_slab1", "value": True}, headers=auth)
+    changes = client.get("/api/milestones/grid", params={"since": cursor}, headers=auth).json()
+    assert [r["id"] for r in changes["rows"]] == [row["id"]]
+
+    client.delete(f"/api/milestones/grid/{row['id']}", headers=auth)
+    changes = client.get("/api/milestones/grid", params={"since": changes["cursor"]}, headers=auth).json()
+    assert changes["deleted"] == [row["id"]]
+
+
+def test_delta_includes_rows_committed_with_an_older_timestamp(client, auth, db):
+    """A writer that stamped updated_at before an earlier poll but committed after
+    it (lock wait, clock skew between instances) must still be delivered."""
+    create_project(client, auth, "Delta Sync Late")
+    row = grid_row_for(client, auth, "Delta Sync Late")
+    cursor = client.get("/api/milestones/grid", headers=auth).headers["X-Grid-Cursor"]
+
+    late = db.get(MilestoneGrid, row["id"])
+    late.priority = "High"
+    late.updated_at = datetime.utcnow() - timedelta(hours=1)
+    db.commit()
+
+    changes = client.get("/api/milestones/grid", params={"since": cursor}, headers=auth).json()
+    assert [r["id"] for r in changes["rows"]] == [row["id"]]
+
+
+def test_invalid_cursor_is_rejected(client, auth):
+    response = client.get("/api/milestones/grid", params={"since": "not-a-cursor"}, headers=auth)
+    assert response.status_code == 400
@@ -0,0 +1,49 @@
+"""Keyset pagination on the list endpoints."""
+from datetime import datetime, timedelta
+
+from models import Issue
+from tests.conftest import create_project
+
+ISSUE_COUNT = 130  # more than LIST_PAGE_SIZE
+
+
+def seed_issues(client, auth, db) -> None:
+    if db.query(Issue).filter(Issue.title.like("Paged issue %")).count():
+        return
+    project = create_project(client, auth, "Paged Issues")
+    start = datetime(2026, 1, 1)
+    db.add_all([
+        # Pairs share a timestamp, so pages must break ties by id
+        Issue(project_id=project["id"], title=f"Paged issue {i}", description="d", severity="Low",
+              created_by=1, created_at=start + timedelta(minutes=i // 2), updated_at=start)
+        for i in range(ISSUE_COUNT)
+    ])
+    db.commit()
+
+
+def test_list_without_limit_returns_every_row(client, auth, db):
+    seed_issues(client, auth, db)
+    response = client.get("/api/issues", headers=auth)
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
+    assert len(response.json()) >= ISSUE_COUNT
+
+
+def test_pages_follow_next_cursor_to_the_end(client, auth, db):
+    seed_issues(client, auth, db)
+    expected = [issue["id"] for issue in client.get("/api/issues", headers=auth).json()]
+
+    seen, params = [], {"limit": 50}
+    while True:
+        page = client.get("/api/issues", params=params, headers=auth).json()
+        assert len(page["items"]) <= 50
+        seen += [issue["id"] for issue in page["items"]]
+        if page["next_cursor"] is None:
+            break
+        params = {"limit": 50, "cursor": page["next_cursor"]}
+    assert seen == expected
+
+
+def test_invalid_limit_and_cursor_are_rejected(client, auth):
+    assert client.get("/api/issues", params={"limit": 0}, headers=auth).status_code == 400
+    assert client.get("/api/issues", params={"cursor": "nope"}, headers=auth).status_code == 400
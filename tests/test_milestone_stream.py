@@ -0,0 +1,42 @@
+"""Authentication of the milestone grid event stream."""
+import threading
+
+import grid_events
+import principal
+from tests.conftest import register_and_login
+
+
+def stream_token(client, auth) -> str:
+    response = client.post("/api/milestones/stream-token", headers=auth)
+    assert response.status_code == 200, response.text
+    return response.json()["token"]
+
+
+def test_login_token_is_not_accepted_in_the_url(client, auth):
+    login_token = auth["Authorization"].split()[1]
+    response = client.get("/api/milestones/stream", params={"token": login_token})
+    assert response.status_code == 401
+
+
+def test_stream_token_is_not_a_bearer_token(client, auth):
+    token = stream_token(client, auth)
+    response = client.get("/api/projects", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+
+
+def test_stream_closes_when_the_user_is_revoked(client, monkeypatch):
+    auth = register_and_login(client, "stream.revoked@example.com")
+    user_id = client.get("/api/auth/me", headers=auth).json()["id"]
+    token = stream_token(client, auth)
+    monkeypatch.setattr(grid_events, "STREAM_KEEPALIVE_SECONDS", 0.05)
+
+    # TestClient returns once the stream ends, so revoke from another thread
+    revoke = threading.Timer(0.3, principal.revoke_before, (user_id, 1))
+    revoke.start()
+    response = client.get("/api/milestones/stream", params={"token": token})
+    revoke.join()
+    assert response.status_code == 200
+    assert "event: revoked" in response.text
+
+    response = client.get("/api/milestones/stream", params={"token": token})
+    assert response.status_code == 401
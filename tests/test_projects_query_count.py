@@ -0,0 +1,26 @@
+"""GET /api/projects loads every project with its grid progress in a fixed number of queries."""
+from query_stats import assert_max_queries
+from tests.conftest import create_project
+
+PROJECT_LIST_MAX_QUERIES = 4
+
+
+def list_projects_query_count(client, auth) -> int:
+    with assert_max_queries(PROJECT_LIST_MAX_QUERIES) as queries:
+        response = client.get("/api/projects", headers=auth)
+    assert response.status_code == 200, response.text
+    return queries.count
+
+
+def test_project_list_query_count_does_not_grow_with_projects(client, auth):
+    n = 5
+    for i in range(n):
+        create_project(client, auth, f"Query Count A{i}")
+    client.get("/api/projects", headers=auth)  # warm the user and token caches
+    with_n = list_projects_query_count(client, auth)
+
+    for i in range(n):
+        create_project(client, auth, f"Query Count B{i}")
+    with_2n = list_projects_query_count(client, auth)
+
+    assert 0 < with_n == with_2n
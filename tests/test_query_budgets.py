@@ -0,0 +1,25 @@
+"""Statement budgets for hot endpoints, enforced with query_stats.assert_max_queries.
+TestClient serves each request on another thread; the capture still sees it."""
+import pytest
+
+from query_stats import assert_max_queries
+from tests.conftest import create_project
+
+
+def test_auth_me_is_served_from_the_caches_when_warm(client, auth):
+    client.get("/api/auth/me", headers=auth)
+    with assert_max_queries(0):
+        response = client.get("/api/auth/me", headers=auth)
+    assert response.status_code == 200
+
+
+def test_create_project_query_budget(client, auth):
+    with assert_max_queries(8) as queries:
+        create_project(client, auth, "Query Budget")
+    assert queries.count > 0
+
+
+def test_budget_overrun_fails_with_the_statements(client, auth):
+    with pytest.raises(AssertionError, match="expected at most 0"):
+        with assert_max_queries(0):
+            client.get("/api/projects", headers=auth)
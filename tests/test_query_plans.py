@@ -0,0 +1,69 @@
+"""
+The hot list queries must be served by an index: each endpoint below is called
+through the app, the statements it runs against its table are captured, and
+EXPLAIN QUERY PLAN for each of them may not contain a full table scan. The plans
+come from the test database, which the migrations built.
+"""
+import pytest
+
+from database import engine
+from query_stats import assert_max_queries
+from tests.conftest import create_project
+
+# (method, path, query params, table whose statements are checked)
+ENDPOINTS = [
+    ("GET", "/api/notifications", {}, "notifications"),
+    ("PUT", "/api/notifications/mark-read", {}, "notifications"),
+    ("GET", "/api/activity-logs", {"project_id": "{project_id}"}, "activity_logs"),
+    ("GET", "/api/activity-logs", {"project_id": "{project_id}", "limit": 5}, "activity_logs"),
+    ("GET", "/api/tasks/assigned-by-me", {}, "activity_logs"),
+    ("GET", "/api/issues", {}, "issues"),
+    ("GET", "/api/issues", {"limit": 5}, "issues"),
+    ("GET", "/api/issues", {"project_id": "{project_id}"}, "issues"),
+    ("GET", "/api/design-deliverables", {"project_id": "{project_id}"}, "design_deliverables"),
+    ("GET", "/api/design-deliverables", {"project_id": "{project_id}", "type": "Drawings"}, "design_deliverables"),
+    ("GET", "/api/documents", {"project_id": "{project_id}"}, "documents"),
+    ("GET", "/api/documents", {"project_id": "{project_id}", "type": "Drawings"}, "documents"),
+    ("GET", "/api/scope", {"project_id": "{project_id}"}, "scope_items"),
+    ("GET", "/api/scope", {"project_id": "{project_id}", "milestone_id": 1}, "scope_items"),
+]
+
+
+def is_full_scan(detail: str) -> bool:
+    """SQLite reports a table scan as 'SCAN <table>' (no 'USING ... INDEX')"""
+    return detail.startswith("SCAN ") and "INDEX" not in detail
+
+
+def touches(statement: str, table: str) -> bool:
+    sql = " ".join(statement.split())
+    return f"FROM {table}" in sql or sql.startswith(f"UPDATE {table} ") or sql.startswith(f"DELETE FROM {table} ")
+
+
+def query_plan(statement: str) -> list:
+    """EXPLAIN QUERY PLAN for a captured statement; the plan does not depend on the bound values"""
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", (None,) * statement.count("?"))
+        return [row[3] for row in rows]
+
+
+@pytest.fixture(scope="module")
+def project_id(client, auth):
+    return create_project(client, auth, "Query Plans")["id"]
+
+
+@pytest.mark.parametrize(
+    "method, path, params, table", ENDPOINTS,
+    ids=[f"{method} {path}" + (f"?{'&'.join(params)}" if params else "") for method, path, params, _ in ENDPOINTS],
+)
+def test_endpoint_queries_use_an_index(client, auth, project_id, method, path, params, table):
+    params = {key: str(value).format(project_id=project_id) for key, value in params.items()}
+    with assert_max_queries(50) as queries:
+        response = client.request(method, path, params=params, headers=auth)
+    assert response.status_code == 200, response.text
+
+    statements = [sql for sql in queries.statements if touches(sql, table)]
+    assert statements, f"{method} {path} ran no statement against {table}"
+    for sql in statements:
+        plan = query_plan(sql)
+        scans = [detail for detail in plan if is_full_scan(detail)]
+        assert not scans, f"{method} {path} falls back to a full table scan:\n{sql}\n" + "\n".join(plan)
@@ -0,0 +1,28 @@
+"""Tokens of users deleted or deactivated outside the app stop working after the next revocation refresh."""
+import pytest
+from sqlalchemy import text
+
+import server
+from tests.conftest import create_project, register_and_login
+
+OUT_OF_BAND = {
+    "deleted": "DELETE FROM users WHERE id = :id",
+    "deactivated": "UPDATE users SET is_active = 0 WHERE id = :id",
+}
+
+
+@pytest.mark.parametrize("change", OUT_OF_BAND)
+def test_out_of_band_user_change_revokes_the_token(client, auth, db, change):
+    project = create_project(client, auth, f"Revocation {change}")
+    user_auth = register_and_login(client, f"revoked.{change}@example.com")
+    user_id = client.get("/api/auth/me", headers=user_auth).json()["id"]
+    issue = {"project_id": project["id"], "title": "Leak", "description": "Water", "severity": "High"}
+    assert client.post("/api/issues", json=issue, headers=user_auth).status_code == 200
+
+    db.execute(text(OUT_OF_BAND[change]), {"id": user_id})
+    db.commit()
+    server.refresh_revocations()
+
+    assert client.post("/api/issues", json=issue, headers=user_auth).status_code == 401
+    assert client.get("/api/projects", headers=user_auth).status_code == 401
+    assert client.get("/api/projects", headers=auth).status_code == 200